@@ -22,6 +22,49 @@ logger = logging.getLogger("agent")
 # Action names for visualization (must match ACTION_SPACE in runner/one_step.py)
 ACTION_NAMES = ["noop", "+CPU", "+Mem", "+Rep", "-CPU", "-Mem", "-Rep"]
 
+def moving_average(values, window):
+    """Trailing mean over ``window`` samples ("valid" mode), in O(N) via a cumulative sum."""
+    import numpy as np
+
+    c = np.cumsum(np.insert(np.asarray(values, dtype=np.float64), 0, 0.0))
+    return (c[window:] - c[:-window]) / window
+
+
+class ExplorationDraws:
+    """
+    Pregenerated epsilon-greedy randomness, consumed one step at a time.
+
+    Each ``draw()`` returns a ``(uniform, random_action)`` pair from a pool
+    filled ``pool_size`` entries at a time by two vectorized NumPy calls, so
+    ``act()`` pays one list lookup instead of two Python RNG calls. Each
+    refill is seeded from the ``random`` module, so runs that seed it (as
+    ``runner/one_step.py`` does) stay reproducible.
+    """
+
+    def __init__(self, n_actions, pool_size=1024):
+        self.n_actions = n_actions
+        self.pool_size = pool_size
+        self._i = pool_size
+        self._uniform = self._actions = None
+
+    def draw(self):
+        if self._i == self.pool_size:
+            self._refill()
+        i = self._i
+        self._i += 1
+        return self._uniform[i], self._actions[i]
+
+    def _refill(self):
+        import random
+
+        import numpy as np
+
+        rng = np.random.default_rng(random.getrandbits(64))
+        self._uniform = rng.random(self.pool_size).tolist()
+        self._actions = rng.integers(0, self.n_actions, size=self.pool_size).tolist()
+        self._i = 0
+
+
 class AgentType(Enum):
     DQN            = "dqn"
     EPSILON_GREEDY = "greedy"
@@ -45,7 +88,9 @@ class Agent:
 
     All agent types expose:
         act(...)                  → int
+        act_batch(states)         → np.ndarray  (DQN / epsilon-greedy / random only)
         update(...)               → None
+        update_batch(...)         → None        (DQN only)
         save(path)                → None
         load(path)                → None
         reset()                   → None
@@ -76,6 +121,15 @@ class Agent:
                 replay_buffer_size = kwargs.get("replay_buffer_size", 2000),
                 batch_size         = kwargs.get("batch_size", 32),
                 target_update_freq = kwargs.get("target_update_freq", 50),
+                compile_network    = kwargs.get("compile_network", False),
+                hidden_dims        = kwargs.get("hidden_dims", (24, 48)),
+                limit_cpu_threads  = kwargs.get("limit_cpu_threads", False),
+                tau                = kwargs.get("tau"),
+                replay_obs_dtype   = kwargs.get("replay_obs_dtype", "float32"),
+                train_freq         = kwargs.get("train_freq", 1),
+                cuda_graph         = kwargs.get("cuda_graph", False),
+                replay_on_device   = kwargs.get("replay_on_device", False),
+                huber_loss         = kwargs.get("huber_loss", False),
             )
 
         elif agent_type == AgentType.EPSILON_GREEDY:
@@ -119,9 +173,19 @@ class Agent:
     def act(self, *args: Any, **kwargs: Any) -> int:
         return self._agent.act(*args, **kwargs)
 
+    def act_batch(self, states: Any) -> Any:
+        if not hasattr(self._agent, "act_batch"):
+            raise NotImplementedError(f"{self._type.value} agents do not support act_batch()")
+        return self._agent.act_batch(states)
+
     def update(self, *args: Any, **kwargs: Any) -> None:
         self._agent.update(*args, **kwargs)
 
+    def update_batch(self, *args: Any, **kwargs: Any) -> None:
+        if not hasattr(self._agent, "update_batch"):
+            raise NotImplementedError(f"{self._type.value} agents do not support update_batch()")
+        self._agent.update_batch(*args, **kwargs)
+
     def save(self, path: str) -> None:
         self._agent.save(path)
 
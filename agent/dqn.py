@@ -1,21 +1,41 @@
-import random
 import math
 import os
-from collections import deque, namedtuple
+from collections import namedtuple
 
+import numpy as np
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 
-from .agent import ACTION_NAMES, ConcreteAgent
+from .agent import ACTION_NAMES, ConcreteAgent, ExplorationDraws, moving_average
 
 
 ###############################################################################
 # Q-Network
 ###############################################################################
 
+DEFAULT_HIDDEN_DIMS = (24, 48)
+
+# Eager train steps run before the CUDA-graph path captures _train_step
+CUDA_GRAPH_WARMUP_STEPS = 3
+
+# Train-step losses are kept on device and copied to loss_history in batches
+# of this many, so the hot path never waits on a device-to-host sync
+LOSS_FLUSH_INTERVAL = 100
+
+# Below this many weights in the widest layer (state_dim * max hidden width)
+# a training step is dominated by kernel-launch and host-device transfer
+# latency, so the agent picks CPU even when CUDA is available.
+GPU_MIN_LAYER_SIZE = 4096
+
+# Replay minibatches are drawn without replacement only while the buffer
+# holds fewer than this many batches' worth of transitions
+WITHOUT_REPLACEMENT_RATIO = 8
+
+
 class QNetwork(nn.Module):
-    def __init__(self, state_dim, action_dim, hidden_dims=(24, 48)):
+    def __init__(self, state_dim, action_dim, hidden_dims=DEFAULT_HIDDEN_DIMS):
         super().__init__()
         self.net = nn.Sequential(
             nn.Linear(state_dim, hidden_dims[0]),
@@ -39,17 +59,216 @@ Transition = namedtuple(
 
 
 class ReplayMemory:
-    def __init__(self, capacity):
-        self.buffer = deque(maxlen=capacity)
+    """
+    Fixed-capacity ring buffer stored as a structure of arrays.
+
+    Each field lives in one preallocated host-side NumPy array indexed by a
+    write cursor, so ``push`` is a handful of in-place copies and nothing in
+    the buffer is tracked by autograd or occupies device memory. ``sample``
+    gathers a minibatch per field and moves it to ``device`` in one transfer,
+    returning already stacked tensors (no ``torch.cat``).
+
+    When ``device`` is a GPU, one page-locked staging tensor of
+    ``(batch_size, ...)`` per field is allocated up front; minibatches are
+    gathered straight into them and all five copies are queued with
+    ``non_blocking=True`` on a dedicated copy stream, so they overlap
+    whatever the previous train step still has running on the compute
+    stream. The compute stream waits on the copy stream only when the batch
+    is returned.
+
+    Observations can be stored in a compact ``obs_dtype`` (``np.float16``
+    halves buffer memory and transfer size for the normalized float states;
+    ``np.uint8`` suits raw integer observations); they are transferred in
+    that dtype and cast to float32 (and multiplied by ``obs_scale``) on the
+    target device.
+
+    Given ``n_actions`` (at most 256), actions are stored as ``uint8`` and
+    widened to int64 for ``gather`` after the transfer; dones are ``bool``.
+
+    With ``device_storage=True`` the same arrays are allocated as tensors on
+    ``device`` instead: each push pays one small host-to-device copy, and
+    ``sample`` becomes an on-device index draw + ``index_select`` with no
+    minibatch transfer at all.
+    """
+
+    def __init__(
+        self, capacity, state_dim, device=None, obs_dtype=np.float32, obs_scale=1.0, batch_size=None, n_actions=None,
+        device_storage=False
+    ):
+        self.capacity = capacity
+        self.state_dim = state_dim
+        self.device = torch.device("cpu") if device is None else torch.device(device)
+        self.device_storage = device_storage
+        self.pin_memory = self.device.type == "cuda" and not device_storage
+        self.obs_dtype = np.dtype(obs_dtype)
+        self.obs_scale = obs_scale
+
+        self.states = np.empty((capacity, state_dim), dtype=self.obs_dtype)
+        action_dtype = np.uint8 if n_actions is not None and n_actions <= 256 else np.int64
+        self.actions = np.empty((capacity, 1), dtype=action_dtype)
+        self.next_states = np.empty((capacity, state_dim), dtype=self.obs_dtype)
+        self.rewards = np.empty(capacity, dtype=np.float32)
+        self.dones = np.empty(capacity, dtype=np.bool_)
+
+        if device_storage:
+            # Move the storage itself; the arrays above are only placeholders
+            for name in ("states", "actions", "next_states", "rewards", "dones"):
+                setattr(self, name, torch.from_numpy(getattr(self, name)).to(self.device))
+            self._views = Transition(self.states, self.actions, self.next_states, self.rewards, self.dones)
+        else:
+            # Tensor views sharing memory with the arrays above, used for gathers
+            self._views = Transition(
+                state=torch.from_numpy(self.states),
+                action=torch.from_numpy(self.actions),
+                next_state=torch.from_numpy(self.next_states),
+                reward=torch.from_numpy(self.rewards),
+                done=torch.from_numpy(self.dones),
+            )
+
+        # Pinned staging tensors and the event marking when the last copy out
+        # of them has finished (they must not be overwritten before that)
+        self._staging = None
+        self._copy_done = None
+        self._copy_stream = torch.cuda.Stream(self.device) if self.pin_memory else None
+        self._prefetched = None
+        if self.pin_memory and batch_size is not None:
+            self._alloc_staging(batch_size)
+
+        self.pos = 0
+        self.size = 0
+
+    def push(self, state, action, next_state, reward, done):
+        i = self.pos
+        if self.device_storage:
+            self.states[i] = torch.from_numpy(_as_row(state, self.obs_dtype))
+            self.next_states[i] = torch.from_numpy(_as_row(next_state, self.obs_dtype))
+        else:
+            np.copyto(self.states[i], _as_row(state, self.obs_dtype))
+            np.copyto(self.next_states[i], _as_row(next_state, self.obs_dtype))
+        self.actions[i, 0] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+
+        self.pos = (self.pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, states, actions, next_states, rewards, dones):
+        """Write N transitions at once (rows in order, as if pushed one by one)."""
+        states = np.asarray(states, dtype=self.obs_dtype).reshape(-1, self.state_dim)
+        n = states.shape[0]
+        # Only the last `capacity` rows can survive the wraparound
+        keep = slice(max(0, n - self.capacity), n)
+        idx = (self.pos + np.arange(n)[keep]) % self.capacity
+        rows = Transition(
+            states[keep],
+            np.asarray(actions).reshape(n, 1)[keep],
+            np.asarray(next_states, dtype=self.obs_dtype).reshape(n, self.state_dim)[keep],
+            np.asarray(rewards, dtype=np.float32).reshape(n)[keep],
+            np.asarray(dones, dtype=np.bool_).reshape(n)[keep],
+        )
+        if self.device_storage:
+            idx = torch.from_numpy(idx).to(self.device)
+            for field, row in zip(self._views, rows):
+                field[idx] = torch.from_numpy(row).to(self.device, field.dtype)
+        else:
+            for field, row in zip((self.states, self.actions, self.next_states, self.rewards, self.dones), rows):
+                field[idx] = row
+
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
 
-    def push(self, *args):
-        self.buffer.append(Transition(*args))
+    def _sample_indices(self, batch_size, device=None):
+        """Draw ``batch_size`` buffer indices uniformly at random.
+
+        ``randint`` is O(batch_size) whatever the capacity. While the buffer
+        holds fewer than ``WITHOUT_REPLACEMENT_RATIO * batch_size``
+        transitions, draw without replacement instead: right after warm-up
+        (size == batch_size) a with-replacement batch is ~1/3 duplicates, and
+        a permutation of a buffer that small is just as cheap.
+        """
+        if self.size < WITHOUT_REPLACEMENT_RATIO * batch_size:
+            return torch.randperm(self.size, device=device)[:batch_size]
+        return torch.randint(0, self.size, (batch_size,), device=device)
 
     def sample(self, batch_size):
-        return random.sample(self.buffer, batch_size)
+        """Return a :class:`Transition` of stacked tensors drawn uniformly at random."""
+        # Indices live on the same device as the storage they index into.
+        if self.device_storage:
+            idx = self._sample_indices(batch_size, device=self.device)
+            batch = Transition(*(view.index_select(0, idx) for view in self._views))
+        elif self.pin_memory:
+            batch, self._prefetched = self._prefetched, None
+            if batch is None or batch.state.shape[0] != batch_size:
+                batch = self._copy_pinned(batch_size)
+            compute = torch.cuda.current_stream(self.device)
+            compute.wait_stream(self._copy_stream)
+            # Allocated on the copy stream but used on the compute stream
+            for t in batch:
+                t.record_stream(compute)
+        else:
+            idx = self._sample_indices(batch_size)
+            batch = Transition(*(view.index_select(0, idx).to(self.device) for view in self._views))
+
+        return batch._replace(
+            state=self._scale_obs(batch.state),
+            action=batch.action.long(),
+            next_state=self._scale_obs(batch.next_state),
+        )
+
+    def prefetch(self, batch_size):
+        """
+        Start gathering and copying the next minibatch so the following
+        ``sample`` finds it already in flight (pinned CUDA path only).
+
+        The prefetched batch is drawn from the buffer as it is now, so it
+        misses transitions pushed before that ``sample`` call.
+        """
+        if self.pin_memory and self.size >= batch_size:
+            self._prefetched = self._copy_pinned(batch_size)
+
+    def _copy_pinned(self, batch_size):
+        idx = self._sample_indices(batch_size)
+        gathered = self._gather_pinned(idx, batch_size)
+        with torch.cuda.stream(self._copy_stream):
+            batch = Transition(*(t.to(self.device, non_blocking=True) for t in gathered))
+            self._copy_done = torch.cuda.Event()
+            self._copy_done.record()
+        return batch
+
+    def _alloc_staging(self, batch_size):
+        self._staging = Transition(*(
+            torch.empty((batch_size,) + tuple(view.shape[1:]), dtype=view.dtype, pin_memory=True)
+            for view in self._views
+        ))
+        self._copy_done = None
+
+    def _gather_pinned(self, idx, batch_size):
+        if self._staging is None or self._staging.state.shape[0] != batch_size:
+            self._alloc_staging(batch_size)
+        elif self._copy_done is not None:
+            # The previous minibatch may still be in flight out of these buffers
+            self._copy_done.synchronize()
+        return Transition(*(
+            torch.index_select(view, 0, idx, out=stage)
+            for view, stage in zip(self._views, self._staging)
+        ))
+
+    def _scale_obs(self, tensor):
+        if self.obs_dtype != np.float32:
+            tensor = tensor.float()
+        if self.obs_scale != 1.0:
+            tensor = tensor.mul_(self.obs_scale)
+        return tensor
 
     def __len__(self):
-        return len(self.buffer)
+        return self.size
+
+
+def _as_row(state, dtype=np.float32):
+    """Flatten a state (list, ndarray, or tensor) into a 1-D array of ``dtype``."""
+    if isinstance(state, torch.Tensor):
+        state = state.detach().cpu().numpy()
+    return np.asarray(state).astype(dtype, copy=False).reshape(-1)
 
 
 ###############################################################################
@@ -69,7 +288,16 @@ class DQNAgent(ConcreteAgent):
         replay_buffer_size=2000,
         batch_size=32,
         target_update_freq=50,
-        device=None
+        device=None,
+        compile_network=False,
+        hidden_dims=DEFAULT_HIDDEN_DIMS,
+        limit_cpu_threads=False,
+        tau=None,
+        replay_obs_dtype=np.float32,
+        train_freq=1,
+        cuda_graph=False,
+        replay_on_device=False,
+        huber_loss=False
     ):
         self.state_dim = state_dim
         self.n_actions = n_actions
@@ -77,65 +305,223 @@ class DQNAgent(ConcreteAgent):
         self.eps_start = eps_start
         self.eps_end = eps_end
         self.eps_decay_steps = eps_decay_steps
+        # Linear decay from eps_start, indexed by step; eps_end once exhausted
+        self._eps_table = (
+            eps_start - (eps_start - eps_end) * (np.arange(eps_decay_steps) / eps_decay_steps)
+        ).tolist()
         self.batch_size = batch_size
         self.target_update_freq = target_update_freq
+        # Run a gradient step only every train_freq environment steps
+        self.train_freq = train_freq
+        # Polyak coefficient: when set, the target net tracks q_net softly after
+        # every optimizer step and the periodic hard copy is skipped
+        self.tau = tau
+        # Huber (smooth L1) TD loss, as in the original DQN; MSE otherwise
+        self.huber_loss = huber_loss
         
+        self.hidden_dims = tuple(hidden_dims)
+
         # Device setup
         if device is None:
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            self.device = self._auto_device(state_dim, self.hidden_dims)
         else:
-            self.device = device
+            self.device = torch.device(device)
+
+        # Process-wide, CUDA only: let float32 matmuls use TF32 tensor cores
+        # (Ampere+). cudnn.benchmark is left alone: QNetwork has no
+        # convolutions, so there is nothing for the autotuner to pick.
+        if self.device.type == "cuda":
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.set_float32_matmul_precision("high")
+
+        # Opt-in, process-wide: for a tiny MLP on CPU, intra-op thread fan-out
+        # costs more than the matmuls themselves.
+        if (
+            limit_cpu_threads
+            and self.device.type == "cpu"
+            and state_dim * max(self.hidden_dims) < GPU_MIN_LAYER_SIZE
+        ):
+            torch.set_num_threads(1)
 
         # Networks
-        self.q_net = QNetwork(state_dim, n_actions).to(self.device)
-        self.target_net = QNetwork(state_dim, n_actions).to(self.device)
-        self.target_net.load_state_dict(self.q_net.state_dict())
+        self.q_net = QNetwork(state_dim, n_actions, self.hidden_dims).to(self.device)
+        self.target_net = QNetwork(state_dim, n_actions, self.hidden_dims).to(self.device)
+        # The target net is only ever read; in-place syncs keep requires_grad off
+        self.target_net.requires_grad_(False)
+        self._q_params = list(self.q_net.parameters())
+        self._target_params = list(self.target_net.parameters())
+        self._sync_target_net()
         self.target_net.eval()
 
-        # Optimizer
-        self.optimizer = optim.RMSprop(self.q_net.parameters(), lr=learning_rate)
+        # Forward callables used on the hot path. With compile_network the
+        # modules are wrapped by torch.compile (CUDA graphs on GPU); q_net and
+        # target_net themselves stay plain modules so checkpoints keep the
+        # same state_dict keys.
+        #
+        # Shapes are specialized (dynamic=False), so each distinct batch size
+        # gets its own graph: _train_step always feeds (batch_size, state_dim),
+        # act() feeds (1, state_dim), and act_batch() one graph per N used.
+        # Keep N fixed when calling act_batch() in a loop, or every new N
+        # triggers a recompile (and, on GPU, a new CUDA graph capture).
+        self._q_forward = self.q_net
+        self._target_forward = self.target_net
+        if compile_network:
+            mode = "reduce-overhead" if self.device.type == "cuda" else "default"
+            self._q_forward = torch.compile(self.q_net, mode=mode, fullgraph=True, dynamic=False)
+            self._target_forward = torch.compile(self.target_net, mode=mode, fullgraph=True, dynamic=False)
+            # Fuse the target computation and loss around the two forwards
+            self._compute_loss = torch.compile(self._compute_loss, mode=mode, dynamic=False)
+
+        # Replay the whole train step as one CUDA graph (fixed shapes only).
+        # compile_network already graphs the forwards under reduce-overhead,
+        # so the two are mutually exclusive.
+        if cuda_graph and compile_network:
+            raise ValueError("cuda_graph and compile_network cannot be combined")
+        self._use_cuda_graph = cuda_graph and self.device.type == "cuda"
+        self._graph = None
+        self._graph_warmup = 0
+
+        # Optimizer (multi-tensor implementation: one kernel per op across all params).
+        # A captured step needs its step counters on device, hence capturable.
+        self.optimizer = optim.RMSprop(
+            self.q_net.parameters(), lr=learning_rate, foreach=True, capturable=self._use_cuda_graph
+        )
+
+        # Persistent act() input, plus a pinned host stage on CUDA so the
+        # per-step H2D copy is a real async DMA
+        self._act_in = torch.empty(1, state_dim, device=self.device)
+        self._act_stage = (
+            torch.empty(1, state_dim, pin_memory=True) if self.device.type == "cuda" else None
+        )
+
+        # Scratch space for the Bellman target, reused every train step
+        self._target_buf = torch.empty(batch_size, 1, device=self.device)
+
+        # Replay memory. Observations arrive as normalized floats, so only
+        # float storage is allowed here; an integer dtype would truncate them
+        # (ReplayMemory's obs_scale is for callers that quantize themselves).
+        if np.dtype(replay_obs_dtype) not in (np.float16, np.float32):
+            raise ValueError(
+                f"replay_obs_dtype must be float16 or float32, got {np.dtype(replay_obs_dtype)}"
+            )
+        self.memory = ReplayMemory(
+            replay_buffer_size, state_dim, self.device, obs_dtype=replay_obs_dtype, batch_size=batch_size,
+            n_actions=n_actions, device_storage=replay_on_device
+        )
+
+        # Static inputs the captured train step reads from
+        if self._use_cuda_graph:
+            self._g_batch = Transition(
+                torch.empty(batch_size, state_dim, device=self.device),
+                torch.empty(batch_size, 1, dtype=torch.int64, device=self.device),
+                torch.empty(batch_size, state_dim, device=self.device),
+                torch.empty(batch_size, device=self.device),
+                torch.empty(batch_size, dtype=torch.bool, device=self.device),
+            )
 
-        # Replay memory
-        self.memory = ReplayMemory(replay_buffer_size)
+        # Pregenerated exploration randomness for act()
+        self._draws = ExplorationDraws(n_actions)
+
+        # On-device actions from act_async() not yet fetched by drain()
+        self._pending_actions = []
 
         # Metrics tracking
         self.total_steps = 0
         self.reward_history = []
+        self._pending_losses = []
         self.loss_history = []
         
         # Variable-length episode tracking
         self.current_episode_reward = 0.0
         self.episode_reward_history = []
+        self._batch_episode_rewards = None
+
+    @staticmethod
+    def _auto_device(state_dim, hidden_dims):
+        """Pick CUDA only when the network is large enough to benefit from it."""
+        if torch.cuda.is_available() and state_dim * max(hidden_dims) >= GPU_MIN_LAYER_SIZE:
+            return torch.device("cuda")
+        return torch.device("cpu")
 
     def _calculate_epsilon(self):
-        """Calculate current epsilon value based on decay schedule."""
+        """Look up the current epsilon value in the precomputed decay schedule."""
         if self.total_steps >= self.eps_decay_steps:
             return self.eps_end
-        return self.eps_start - (self.eps_start - self.eps_end) * (
-            self.total_steps / self.eps_decay_steps
-        )
+        return self._eps_table[self.total_steps]
 
     def act(self, state):
         """Select action using epsilon-greedy policy."""
         epsilon = self._calculate_epsilon()
         
         # Exploration
-        if random.random() < epsilon:
-            return random.randrange(self.n_actions)
-        
-        # Exploitation
-        if not isinstance(state, torch.Tensor):
-            state = torch.tensor(state, dtype=torch.float32, device=self.device)
-        
-        if state.dim() == 1:
-            state = state.unsqueeze(0)
+        u, random_action = self._draws.draw()
+        if u < epsilon:
+            return random_action
         
-        with torch.no_grad():
-            # Set to eval mode so BatchNorm doesn't crash on batch_size=1
-            self.q_net.eval()
-            q_values = self.q_net(state)
-            self.q_net.train()
-            return q_values.argmax(dim=1).item()
+        # Exploitation: write the state into the persistent (1, state_dim) input
+        state = torch.as_tensor(state, dtype=torch.float32).reshape(1, -1)
+        if self._act_stage is not None and state.device.type == "cpu":
+            # The previous step's copy out of the stage finished when its
+            # Q-values were pulled back, so it is free to overwrite
+            self._act_stage.copy_(state)
+            state = self._act_stage
+        self._act_in.copy_(state, non_blocking=True)
+
+        with torch.inference_mode():
+            # QNetwork has no BatchNorm/Dropout, so no eval()/train() toggling
+            q_values = self._q_forward(self._act_in)
+        # The action has to reach env.step() on the host anyway: pull the
+        # n_actions Q-values back in one copy and take the argmax there,
+        # rather than launching a device argmax and then syncing on .item()
+        return int(q_values[0].cpu().argmax())
+
+    def act_batch(self, states):
+        """
+        Select actions for a batch of states ``(N, state_dim)`` with one forward pass.
+
+        Exploration is decided per row with on-device RNG, so the whole batch is
+        resolved without Python branching; returns an int64 array of N actions.
+        """
+        if not isinstance(states, torch.Tensor):
+            states = torch.as_tensor(np.asarray(states, dtype=np.float32))
+        states = states.to(self.device, dtype=torch.float32)
+        if states.dim() != 2:
+            raise ValueError(
+                f"act_batch expects states of shape (N, state_dim), got {tuple(states.shape)}; "
+                "use act() for a single state"
+            )
+        return self._select_actions(states).cpu().numpy()
+
+    def act_async(self, state):
+        """
+        Epsilon-greedy action for one state, left on the device as a 0-d tensor.
+
+        Nothing is synced back to the host; the action is also queued so a
+        run of N steps can be fetched with a single transfer via ``drain()``.
+        Use ``act()`` when the action is needed right away.
+        """
+        state = torch.as_tensor(state, dtype=torch.float32).reshape(1, -1)
+        action = self._select_actions(state.to(self.device, non_blocking=True))[0]
+        self._pending_actions.append(action)
+        return action
+
+    def drain(self):
+        """Return the actions queued by ``act_async()`` as Python ints, oldest first."""
+        if not self._pending_actions:
+            return []
+        actions = torch.stack(self._pending_actions).cpu().tolist()
+        self._pending_actions.clear()
+        return actions
+
+    def _select_actions(self, states):
+        n = states.shape[0]
+        epsilon = self._calculate_epsilon()
+
+        with torch.inference_mode():
+            greedy_actions = self._q_forward(states).argmax(dim=1)
+            explore = torch.rand(n, device=self.device) < epsilon
+            random_actions = torch.randint(0, self.n_actions, (n,), device=self.device)
+            return torch.where(explore, random_actions, greedy_actions)
 
     def update(self, state, action, next_state, reward, done):
         """Store transition and perform learning update if enough samples."""
@@ -147,74 +533,155 @@ class DQNAgent(ConcreteAgent):
             self.episode_reward_history.append(self.current_episode_reward)
             self.current_episode_reward = 0.0
 
-        # Convert to tensors
-        if not isinstance(state, torch.Tensor):
-            state = torch.tensor(state, dtype=torch.float32, device=self.device)
-        if not isinstance(next_state, torch.Tensor):
-            next_state = torch.tensor(next_state, dtype=torch.float32, device=self.device)
-        
-        if state.dim() == 1:
-            state = state.unsqueeze(0)
-        if next_state.dim() == 1:
-            next_state = next_state.unsqueeze(0)
-        
-        action_tensor = torch.tensor([[action]], device=self.device)
-        reward_tensor = torch.tensor([reward], dtype=torch.float32, device=self.device)
-        done_tensor = torch.tensor([done], dtype=torch.bool, device=self.device)
-
         # Store transition
-        self.memory.push(state, action_tensor, next_state, reward_tensor, done_tensor)
+        self.memory.push(state, action, next_state, reward, done)
 
         # Increment step counter
         self.total_steps += 1
 
-        # Perform learning update if we have enough samples
-        if len(self.memory) >= self.batch_size:
+        # Perform learning update every train_freq steps once we have enough samples
+        if self.total_steps % self.train_freq == 0 and len(self.memory) >= self.batch_size:
             self._train_step()
 
-        # Update target network periodically
-        if self.total_steps % self.target_update_freq == 0:
-            self.target_net.load_state_dict(self.q_net.state_dict())
+        # Update target network periodically (soft updates happen in _train_step)
+        if self.tau is None and self.total_steps % self.target_update_freq == 0:
+            self._sync_target_net()
 
-    def _train_step(self):
-        """Sample from replay buffer and perform one training step."""
-        if len(self.memory) < self.batch_size:
-            return
-            
-        minibatch = self.memory.sample(self.batch_size)
-        batch = Transition(*zip(*minibatch))
+    def update_batch(self, states, actions, next_states, rewards, dones):
+        """
+        Store N transitions from N parallel environments and train as ``update`` would.
 
-        state_batch = torch.cat(batch.state)
-        action_batch = torch.cat(batch.action)
-        reward_batch = torch.cat(batch.reward)
-        next_state_batch = torch.cat(batch.next_state)
-        done_batch = torch.cat(batch.done)
+        Each row counts as one environment step, so ``train_freq`` and
+        ``target_update_freq`` keep their per-step meaning. Episode returns are
+        tracked per row index, so keep each environment in the same row.
+        """
+        rewards = np.asarray(rewards, dtype=np.float64).reshape(-1)
+        dones = np.asarray(dones, dtype=np.bool_).reshape(-1)
+        n = len(rewards)
+        self.reward_history.extend(rewards.tolist())
 
-        # Compute Q(s, a)
-        q_values = self.q_net(state_batch).gather(1, action_batch)
+        # Track true episode returns, one running sum per environment
+        if self._batch_episode_rewards is None or len(self._batch_episode_rewards) != n:
+            self._batch_episode_rewards = np.zeros(n)
+        self._batch_episode_rewards += rewards
+        self.episode_reward_history.extend(self._batch_episode_rewards[dones].tolist())
+        self._batch_episode_rewards[dones] = 0.0
+
+        self.memory.push_batch(states, actions, next_states, rewards, dones)
 
-        # Compute max Q(s', a')
-        next_q_values = torch.zeros(self.batch_size, 1, device=self.device)
-        non_terminal_mask = ~done_batch
+        prev_steps = self.total_steps
+        self.total_steps += n
 
-        if non_terminal_mask.any():
-            with torch.no_grad():
-                next_q_values[non_terminal_mask] = (
-                    self.target_net(next_state_batch[non_terminal_mask])
-                    .max(1)[0]
-                    .unsqueeze(1)
-                )
+        # One learning update per train_freq boundary crossed by these N steps
+        if len(self.memory) >= self.batch_size:
+            for _ in range(self.total_steps // self.train_freq - prev_steps // self.train_freq):
+                self._train_step()
+
+        if self.tau is None and self.total_steps // self.target_update_freq > prev_steps // self.target_update_freq:
+            self._sync_target_net()
+
+    def _sync_target_net(self):
+        """Copy online-network weights into the target network in place."""
+        with torch.no_grad():
+            if hasattr(torch, "_foreach_copy_"):
+                torch._foreach_copy_(self._target_params, self._q_params)
+            else:  # torch < 2.1
+                for dst, src in zip(self._target_params, self._q_params):
+                    dst.copy_(src)
+
+    def _soft_update_target_net(self):
+        """Polyak update: target <- (1 - tau) * target + tau * q, as one multi-tensor op."""
+        with torch.no_grad():
+            torch._foreach_lerp_(self._target_params, self._q_params, self.tau)
 
-        # Compute target: r + gamma * max Q(s', a')
-        target = reward_batch.unsqueeze(1) + self.gamma * next_q_values
+    def _compute_loss(self, batch):
+        """Return the TD loss for one sampled batch (compiled with the networks when enabled)."""
+        # Compute Q(s, a)
+        q_values = self._q_forward(batch.state).gather(1, batch.action)
+
+        # Compute max Q(s', a') over the whole batch in one fixed-shape forward
+        with torch.inference_mode():
+            next_q_values = self._target_forward(batch.next_state).max(1, keepdim=True).values
+            not_done = (~batch.done).unsqueeze(1).to(next_q_values.dtype)
 
-        # Compute loss and update
-        loss = nn.MSELoss()(q_values, target)
-        self.loss_history.append(float(loss.item()))
+        # Compute target: r + gamma * max Q(s', a') * (1 - done), branchless
+        target = torch.addcmul(
+            batch.reward.unsqueeze(1), next_q_values, not_done, value=self.gamma, out=self._target_buf
+        )
+        if self.huber_loss:
+            return F.smooth_l1_loss(q_values, target)
+        return F.mse_loss(q_values, target)
 
-        self.optimizer.zero_grad()
-        loss.backward()
-        self.optimizer.step()
+    def _train_step(self):
+        """Sample from replay buffer and perform one training step."""
+        if len(self.memory) < self.batch_size:
+            return
+            
+        batch = self.memory.sample(self.batch_size)
+        if self._use_cuda_graph:
+            loss = self._graph_train_step(batch)
+        else:
+            loss = self._compute_loss(batch)
+            self.optimizer.zero_grad(set_to_none=True)
+            loss.backward()
+            self.optimizer.step()
+        self._pending_losses.append(loss.detach())
+        if len(self._pending_losses) >= LOSS_FLUSH_INTERVAL:
+            self._flush_losses()
+
+        if self.tau is not None:
+            self._soft_update_target_net()
+
+        # Overlap the next minibatch's gather and H2D copy with this step's kernels
+        self.memory.prefetch(self.batch_size)
+
+    @property
+    def loss_history(self):
+        """Per-train-step losses as floats; reading it flushes losses still on device."""
+        self._flush_losses()
+        return self._loss_history
+
+    @loss_history.setter
+    def loss_history(self, value):
+        self._pending_losses.clear()
+        self._loss_history = value
+
+    def _flush_losses(self):
+        if self._pending_losses:
+            self._loss_history.extend(torch.stack(self._pending_losses).cpu().tolist())
+            self._pending_losses.clear()
+
+    def _graph_train_step(self, batch):
+        """Run one train step through the captured CUDA graph, capturing it after warmup."""
+        for dst, src in zip(self._g_batch, batch):
+            dst.copy_(src, non_blocking=True)
+
+        if self._graph is None:
+            # Warm up on a side stream so autograd and the optimizer allocate
+            # their state outside the capture; each warmup step is a real update
+            side = torch.cuda.Stream()
+            side.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(side):
+                self.optimizer.zero_grad(set_to_none=True)
+                loss = self._compute_loss(self._g_batch)
+                loss.backward()
+                self.optimizer.step()
+            torch.cuda.current_stream().wait_stream(side)
+            self._graph_warmup += 1
+            if self._graph_warmup < CUDA_GRAPH_WARMUP_STEPS:
+                return loss
+
+            # Capture only records kernels, so replay once to apply this batch
+            self._graph = torch.cuda.CUDAGraph()
+            self.optimizer.zero_grad(set_to_none=True)
+            with torch.cuda.graph(self._graph):
+                self._g_loss = self._compute_loss(self._g_batch)
+                self._g_loss.backward()
+                self.optimizer.step()
+
+        self._graph.replay()
+        # The next replay overwrites _g_loss in place
+        return self._g_loss.clone()
 
     def save(self, path: str):
         """
@@ -236,7 +703,11 @@ class DQNAgent(ConcreteAgent):
                 'gamma': self.gamma,
                 'eps_start': self.eps_start,
                 'eps_end': self.eps_end,
-                'eps_decay_steps': self.eps_decay_steps
+                'eps_decay_steps': self.eps_decay_steps,
+                'tau': self.tau,
+                'huber_loss': self.huber_loss,
+                'train_freq': self.train_freq,
+                'hidden_dims': list(self.hidden_dims)
             }
         }
         torch.save(checkpoint, path)
@@ -250,10 +721,29 @@ class DQNAgent(ConcreteAgent):
             raise FileNotFoundError(f"No checkpoint found at {path}")
 
         checkpoint = torch.load(path, map_location=self.device)
+
+        saved_hidden = checkpoint.get('hyperparams', {}).get('hidden_dims')
+        if saved_hidden is not None and tuple(saved_hidden) != self.hidden_dims:
+            raise ValueError(
+                f"Checkpoint {path} was trained with hidden_dims={tuple(saved_hidden)}, "
+                f"but this agent was built with hidden_dims={self.hidden_dims}"
+            )
         
         self.q_net.load_state_dict(checkpoint['q_net_state_dict'])
         self.target_net.load_state_dict(checkpoint['target_net_state_dict'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+        # load_state_dict restores the saving run's capturable flag; match this
+        # agent's mode instead, with step counters on device only when captured
+        for group in self.optimizer.param_groups:
+            group['capturable'] = self._use_cuda_graph
+            for param in group['params']:
+                state = self.optimizer.state.get(param, {})
+                if torch.is_tensor(state.get('step')):
+                    step_device = param.device if self._use_cuda_graph else 'cpu'
+                    state['step'] = state['step'].to(step_device)
+        # The optimizer state tensors were replaced; recapture on the next step
+        self._graph = None
+        self._graph_warmup = 0
         self.total_steps = checkpoint['total_steps']
         self.reward_history = checkpoint.get('reward_history', [])
         self.loss_history = checkpoint.get('loss_history', [])
@@ -275,6 +765,7 @@ class DQNAgent(ConcreteAgent):
         self.loss_history = []
         self.episode_reward_history = []
         self.current_episode_reward = 0.0
+        self._batch_episode_rewards = None
         
         # ADD THIS: Reset total steps to restart epsilon decay for the new environment
         if reset_steps:
@@ -305,28 +796,22 @@ class DQNAgent(ConcreteAgent):
         # Set to eval mode for visualization
         self.q_net.eval()
 
-        # --- STEP 1: Pre-compute all Q-values to find global min and max ---
-        all_q_values = []
-        global_min = float('inf')
-        global_max = float('-inf')
-
+        # --- STEP 1: Pre-compute all Q-values (one forward, one host copy) to find global min and max ---
+        states = []
         for config in configs:
-            states = []
             if state_space == "scale":
                 for p in pending_sweep:
                     states.append([config["cpu"] / 4000, config["mem"] / 4096, p / 5, 2 / 15, 10/15])
             else:
                 for d in distance_sweep:
                     states.append([config["cpu"] / 4000, config["mem"] / 4096, pending / 5, d / 5, replicas_norm])
-                
-            states_tensor = torch.tensor(states, dtype=torch.float32, device=self.device)
-            
-            with torch.no_grad():
-                q_values = self.q_net(states_tensor).cpu()
-                
-            all_q_values.append(q_values)
-            global_min = min(global_min, torch.min(q_values).item())
-            global_max = max(global_max, torch.max(q_values).item())
+
+        states_tensor = torch.tensor(states, dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            all_q_values = self.q_net(states_tensor).cpu().numpy().reshape(len(configs), -1, self.n_actions)
+
+        global_min = float(all_q_values.min())
+        global_max = float(all_q_values.max())
 
         # Determine threshold for text color (black vs white) based on global scale
         if global_max == global_min:
@@ -347,11 +832,9 @@ class DQNAgent(ConcreteAgent):
             ax.set_xticklabels(action_labels, rotation=45, ha='right')
             ax.set_yticks(range(len(distance_sweep)))
             ax.set_yticklabels([f"Dist={r}" for r in distance_sweep])
-            for i in range(len(distance_sweep)):
-                for j in range(self.n_actions):
-                    val = q_values[i, j].item()
-                    color = "black" if val > threshold else "white"
-                    ax.text(j, i, f"{val:.2f}", ha="center", va="center", color=color)
+            for (i, j), val in np.ndenumerate(q_values):
+                color = "black" if val > threshold else "white"
+                ax.text(j, i, f"{val:.2f}", ha="center", va="center", color=color)
             ax.set_xlabel('Action')
             ax.set_ylabel('Distance to target')
             ax.set_title(f"{config['title']}\n(CPU: {config['cpu']}m / Mem: {config['mem']}Mi)")
@@ -415,7 +898,7 @@ class DQNAgent(ConcreteAgent):
             ax.plot(episodes, self.episode_reward_history, marker='o', markersize=8, alpha=0.7, color='blue', label='Total Episode Return')
             if len(self.episode_reward_history) >= 3:
                 window = min(10, len(self.episode_reward_history))
-                rolling_rewards = np.convolve(self.episode_reward_history, np.ones(window)/window, mode='valid')
+                rolling_rewards = moving_average(self.episode_reward_history, window)
                 ax.plot(episodes[window-1:], rolling_rewards, color='darkblue', linewidth=2, label=f'{window}-Ep Moving Avg')
             ax.set_title('Episodic Return (Sum of Rewards per Episode) — cumulative')
             ax.set_xlabel('Episode')
@@ -430,7 +913,7 @@ class DQNAgent(ConcreteAgent):
         ax = axes[1]
         if len(self.reward_history) > 0:
             window = min(100, len(self.reward_history))
-            rolling = np.convolve(self.reward_history, np.ones(window)/window, mode='valid')
+            rolling = moving_average(self.reward_history, window)
             ax.plot(self.reward_history, alpha=0.3, color='green', label='Step Reward')
             ax.plot(np.arange(window-1, len(self.reward_history)), rolling, color='darkgreen', linewidth=2, label=f'{window}-Step Moving Avg')
             ax.set_title('Step Rewards (Per-Step Feedback) — cumulative across all episodes')
@@ -447,11 +930,11 @@ class DQNAgent(ConcreteAgent):
             steps = np.arange(1, len(self.loss_history) + 1)
             ax.plot(steps, self.loss_history, alpha=0.3, color='red', label='Step Loss')
             window = min(50, max(5, len(self.loss_history) // 4))
-            rolling_loss = np.convolve(self.loss_history, np.ones(window)/window, mode='valid')
+            rolling_loss = moving_average(self.loss_history, window)
             ax.plot(steps[window-1:], rolling_loss, color='darkred', linewidth=2, label=f'{window}-Step Moving Avg')
             ax.set_title('DQN Step Loss (recorded when buffer ≥ batch_size)')
             ax.set_xlabel('Update Step')
-            ax.set_ylabel('Loss (MSE)')
+            ax.set_ylabel('Loss (Huber)' if self.huber_loss else 'Loss (MSE)')
             ax.legend()
         else:
             ax.set_title('DQN Loss (No Data Yet — need ≥32 steps in buffer for first update)')
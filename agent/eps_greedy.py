@@ -1,7 +1,10 @@
 import random
 import json
 import os
-from .agent import ACTION_NAMES, ConcreteAgent
+
+import numpy as np
+
+from .agent import ACTION_NAMES, ConcreteAgent, ExplorationDraws, moving_average
 
 
 class EpsilonGreedyAgent(ConcreteAgent):
@@ -9,38 +12,79 @@ class EpsilonGreedyAgent(ConcreteAgent):
         self.n_actions = n_actions
         self.epsilon = epsilon
 
-        self.counts = [0 for _ in range(n_actions)]
-        self.values = [0.0 for _ in range(n_actions)]
+        self.counts = np.zeros(n_actions, dtype=np.int64)
+        self.values = np.zeros(n_actions, dtype=np.float64)
         self.reward_history = []
+        self._reset_best()
+
+        self._rng = np.random.default_rng()
+        self._draws = ExplorationDraws(n_actions)
 
     def act(self, state=None):
         # exploration
-        if random.random() < self.epsilon:
-            return random.randrange(self.n_actions)
+        u, random_action = self._draws.draw()
+        if u < self.epsilon:
+            return random_action
 
         # exploitation (break ties randomly)
-        max_value = max(self.values)
-        best_actions = [
-            i for i, v in enumerate(self.values) if v == max_value
-        ]
-        return random.choice(best_actions)
+        return int(random.choice(self._best_actions()))
+
+    def act_batch(self, states):
+        """Select actions for ``len(states)`` parallel environments in one vectorized draw."""
+        n = len(states)
+        explore = self._rng.random(n) < self.epsilon
+        random_actions = self._rng.integers(0, self.n_actions, size=n)
+
+        # exploitation (break ties randomly, independently per environment)
+        best_actions = self._best_actions()
+        greedy_actions = best_actions[self._rng.integers(0, len(best_actions), size=n)]
+        return np.where(explore, random_actions, greedy_actions)
 
     def update(self, action, reward):
         self.reward_history.append(float(reward))
         self.counts[action] += 1
-        n = self.counts[action]
 
         # incremental average
-        old_value = self.values[action]
-        self.values[action] = old_value + (reward - old_value) / n
+        self.values[action] += (reward - self.values[action]) / self.counts[action]
+
+        # Only values[action] moved, so the argmax set changes incrementally
+        # unless the previous best dropped; when the set is unchanged the
+        # cached indices stay valid
+        value = self.values[action]
+        if value > self._best_value:
+            self._best_mask[:] = False
+            self._best_mask[action] = True
+            self._best_value = value
+        elif value == self._best_value:
+            if self._best_mask[action]:
+                return
+            self._best_mask[action] = True
+        elif self._best_mask[action]:
+            self._reset_best()
+            return
+        else:
+            # A non-best action moved but is still below the best
+            return
+        self._best = None
+
+    def _reset_best(self):
+        """Recompute the argmax set of ``values`` from scratch."""
+        self._best_value = self.values.max()
+        self._best_mask = self.values == self._best_value
+        self._best = None
+
+    def _best_actions(self):
+        if self._best is None:
+            self._best = np.flatnonzero(self._best_mask)
+        return self._best
     
     def save(self, path: str):
         """Save agent state (counts and values) to a JSON file."""
         data = {
             "n_actions": self.n_actions,
             "epsilon": self.epsilon,
-            "counts": self.counts,
-            "values": self.values,
+            "counts": self.counts.tolist(),
+            "values": self.values.tolist(),
             "reward_history": self.reward_history
         }
         with open(path, 'w') as f:
@@ -56,17 +100,20 @@ class EpsilonGreedyAgent(ConcreteAgent):
             data = json.load(f)
         
         self.n_actions = data.get("n_actions", self.n_actions)
+        self._draws = ExplorationDraws(self.n_actions)
         self.epsilon = data.get("epsilon", self.epsilon)
-        self.counts = data.get("counts", self.counts)
-        self.values = data.get("values", self.values)
+        self.counts = np.asarray(data.get("counts", self.counts), dtype=np.int64)
+        self.values = np.asarray(data.get("values", self.values), dtype=np.float64)
         self.reward_history = data.get("reward_history", [])
+        self._reset_best()
         print(f"Loaded EpsilonGreedy agent from {path}")
 
     def reset(self):
         """Reset counts, values, and history."""
-        self.counts = [0 for _ in range(self.n_actions)]
-        self.values = [0.0 for _ in range(self.n_actions)]
+        self.counts = np.zeros(self.n_actions, dtype=np.int64)
+        self.values = np.zeros(self.n_actions, dtype=np.float64)
         self.reward_history = []
+        self._reset_best()
     
     def visualize(self, save_path=None):
         """Visualize the learned Q-values as a bar chart."""
@@ -98,7 +145,7 @@ class EpsilonGreedyAgent(ConcreteAgent):
         plt.figure(figsize=(10, 5))
         if len(self.reward_history) > 0:
             window = min(100, len(self.reward_history))
-            rolling_rewards = np.convolve(self.reward_history, np.ones(window)/window, mode='valid')
+            rolling_rewards = moving_average(self.reward_history, window)
             plt.plot(self.reward_history, alpha=0.3, color='blue', label='Raw Step Reward')
             plt.plot(np.arange(window-1, len(self.reward_history)), rolling_rewards, color='darkblue', label=f'{window}-Step Moving Avg')
             
@@ -4,7 +4,24 @@ Random baseline agent for reinforcement learning.
 import random
 import json
 import os
-from .agent import ConcreteAgent
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+from .agent import ConcreteAgent, moving_average
+
+# Actions are drawn this many at a time and handed out one per act() call
+ACTION_POOL_SIZE = 4096
+
+# Initial capacity of the step-reward buffer; it doubles when full
+REWARD_BUFFER_SIZE = 1024
+
+# Step rewards are strided down to about this many points before plotting
+MAX_PLOT_POINTS = 10_000
 
 
 class RandomAgent(ConcreteAgent):
@@ -16,13 +33,46 @@ class RandomAgent(ConcreteAgent):
         self.episode_reward_history = []
         self.current_episode_reward = 0.0
 
+        self._pool = []
+        self._pool_idx = 0
+        self._rng = np.random.default_rng()
+
+    @property
+    def reward_history(self):
+        """Per-step rewards as a list of floats (a copy; later steps don't change it)."""
+        return self._rewards[:self._n_rewards].tolist()
+
+    @reward_history.setter
+    def reward_history(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self._rewards = np.empty(max(REWARD_BUFFER_SIZE, 2 * len(values)), dtype=np.float64)
+        self._rewards[:len(values)] = values
+        self._n_rewards = len(values)
+
     def act(self, state=None) -> int:
         """Select an action uniformly at random."""
-        return random.randrange(self.n_actions)
+        if self._pool_idx == len(self._pool):
+            self._refill_pool()
+        action = self._pool[self._pool_idx]
+        self._pool_idx += 1
+        return action
+
+    def act_batch(self, states):
+        """Select ``len(states)`` uniformly random actions in one vectorized draw."""
+        return self._rng.integers(0, self.n_actions, size=len(states))
+
+    def _refill_pool(self):
+        # Seeded from the random module so random.seed() keeps runs reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        self._pool = rng.integers(0, self.n_actions, size=ACTION_POOL_SIZE).tolist()
+        self._pool_idx = 0
 
     def update(self, state, action, next_state, reward, done, *args, **kwargs):
         """Track reward history and episode returns for the learning curve plotting."""
-        self.reward_history.append(float(reward))
+        if self._n_rewards == len(self._rewards):
+            self._rewards = np.resize(self._rewards, 2 * len(self._rewards))
+        self._rewards[self._n_rewards] = reward
+        self._n_rewards += 1
         
         # Accumulate episodic return
         self.current_episode_reward += float(reward)
@@ -34,12 +84,18 @@ class RandomAgent(ConcreteAgent):
         """Save agent state (reward history) to a JSON file."""
         data = {
             "n_actions": self.n_actions,
-            "reward_history": self.reward_history,
+            "reward_history": self._rewards[:self._n_rewards],
             "episode_reward_history": self.episode_reward_history,
             "current_episode_reward": self.current_episode_reward
         }
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Compact output: the step history can run to millions of floats
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            data["reward_history"] = self.reward_history
+            with open(path, 'w') as f:
+                json.dump(data, f)
         print(f"Saved Random agent to {path}")
 
     def load(self, path: str):
@@ -47,10 +103,16 @@ class RandomAgent(ConcreteAgent):
         if not os.path.exists(path):
             raise FileNotFoundError(f"No agent file found at {path}")
             
-        with open(path, 'r') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
         
         self.n_actions = data.get("n_actions", self.n_actions)
+        self._pool = []
+        self._pool_idx = 0
         self.reward_history = data.get("reward_history", [])
         self.episode_reward_history = data.get("episode_reward_history", [])
         self.current_episode_reward = data.get("current_episode_reward", 0.0)
@@ -64,8 +126,11 @@ class RandomAgent(ConcreteAgent):
 
     def plot_learning_curve(self, save_path=None):
         """Plot the episodic return and moving average of rewards over time."""
+        import matplotlib
+        if save_path:
+            # Saving needs no GUI; skip probing Tk/Qt on headless machines
+            matplotlib.use("Agg")
         import matplotlib.pyplot as plt
-        import numpy as np
         
         fig, axes = plt.subplots(2, 1, figsize=(10, 7))
         
@@ -76,7 +141,7 @@ class RandomAgent(ConcreteAgent):
             ax.plot(episodes, self.episode_reward_history, marker='o', markersize=8, alpha=0.7, color='blue', label='Total Episode Return')
             if len(self.episode_reward_history) >= 3:
                 window = min(10, len(self.episode_reward_history))
-                rolling_rewards = np.convolve(self.episode_reward_history, np.ones(window)/window, mode='valid')
+                rolling_rewards = moving_average(self.episode_reward_history, window)
                 ax.plot(episodes[window-1:], rolling_rewards, color='darkblue', linewidth=2, label=f'{window}-Ep Moving Avg')
             ax.set_title('Random Agent: Episodic Return')
             ax.set_xlabel('Episode')
@@ -89,11 +154,15 @@ class RandomAgent(ConcreteAgent):
 
         # Plot 2: Step rewards (per-step feedback)
         ax = axes[1]
-        if len(self.reward_history) > 0:
-            window = min(100, len(self.reward_history))
-            rolling = np.convolve(self.reward_history, np.ones(window)/window, mode='valid')
-            ax.plot(self.reward_history, alpha=0.3, color='green', label='Step Reward')
-            ax.plot(np.arange(window-1, len(self.reward_history)), rolling, color='darkgreen', linewidth=2, label=f'{window}-Step Moving Avg')
+        if self._n_rewards > 0:
+            rewards = self._rewards[:self._n_rewards]
+            window = min(100, rewards.size)
+            rolling = moving_average(rewards, window)
+            # Long runs are strided so matplotlib draws O(MAX_PLOT_POINTS) segments
+            stride = max(1, rewards.size // MAX_PLOT_POINTS)
+            steps = np.arange(rewards.size)
+            ax.plot(steps[::stride], rewards[::stride], alpha=0.3, color='green', label='Step Reward')
+            ax.plot(steps[window-1::stride], rolling[::stride], color='darkgreen', linewidth=2, label=f'{window}-Step Moving Avg')
             ax.set_title('Random Agent: Step Rewards')
             ax.set_xlabel('Training Steps')
             ax.set_ylabel('Reward')
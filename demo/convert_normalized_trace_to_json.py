@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
@@ -11,12 +17,23 @@ from env.actions.trace_io import load_trace
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Write trace-normalized.msgpack out as readable JSON.")
+    parser.add_argument("--force", action="store_true", help="Rewrite the JSON even if it is newer than the msgpack")
+    args = parser.parse_args()
+
     demo_dir = Path(__file__).parent
     src = demo_dir / "trace-normalized.msgpack"
     dst = demo_dir / "trace-normalized.json"
 
+    if not args.force and dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+        print(f"{dst} is up to date")
+        return
+
     trace = load_trace(str(src))
-    dst.write_text(json.dumps(trace, indent=2), encoding="utf-8")
+    if orjson is not None:
+        dst.write_bytes(orjson.dumps(trace, option=orjson.OPT_INDENT_2))
+    else:
+        dst.write_text(json.dumps(trace, indent=2), encoding="utf-8")
     print(f"Wrote {dst}")
 
 
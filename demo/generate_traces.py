@@ -13,10 +13,13 @@ Seven scenario types for diverse training (agent randomly gets one per episode):
   trace-cpu-low-mem-high-replicas-over -- Composite: low CPU + high memory + too many replicas
 
 Usage:
-  PYTHONPATH=. python demo/generate_traces.py
+  PYTHONPATH=. python demo/generate_traces.py              # .msgpack only
+  PYTHONPATH=. python demo/generate_traces.py --emit-json  # also write readable .json copies
 """
 
+import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -26,7 +29,7 @@ project_root = script_dir.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from env.actions.trace_io import json_to_msgpack
+from env.actions.trace_io import json_to_msgpack, save_trace
 
 
 def _make_trace(
@@ -199,18 +202,25 @@ TRACES = {
 }
 
 
-def generate_traces(output_dir: Path) -> None:
+def generate_traces(output_dir: Path, emit_json: bool = False) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
 
     for name, trace in TRACES.items():
-        json_path = output_dir / f"{name}.json"
-        msgpack_path = output_dir / f"{name}.msgpack"
-
-        with json_path.open("w") as f:
-            json.dump(trace, f, indent=2)
-
-        json_to_msgpack(str(json_path), str(msgpack_path))
-        print(f"  {name}.json + {name}.msgpack")
+        # Pack the in-memory dict directly; JSON is only a readable side copy
+        save_trace(trace, str(output_dir / f"{name}.msgpack"))
+        if emit_json:
+            json_path = output_dir / f"{name}.json"
+            tmp = json_path.with_name(json_path.name + ".tmp")
+            try:
+                with tmp.open("w", buffering=1 << 20) as f:
+                    json.dump(trace, f, indent=2)
+                os.replace(tmp, json_path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            print(f"  {name}.json + {name}.msgpack")
+        else:
+            print(f"  {name}.msgpack")
 
     # Convert trace-normalized.json (SimKube v2 format) to msgpack if present
     normalized_json = output_dir / "trace-normalized.json"
@@ -222,5 +232,11 @@ def generate_traces(output_dir: Path) -> None:
 
 
 if __name__ == "__main__":
-    output_dir = Path(__file__).parent
-    generate_traces(output_dir)
+    parser = argparse.ArgumentParser(description="Generate the named demo traces.")
+    parser.add_argument(
+        "--emit-json",
+        action="store_true",
+        help="Also write pretty-printed .json copies (the checked-in demo/*.json files come from this)",
+    )
+    args = parser.parse_args()
+    generate_traces(Path(__file__).parent, emit_json=args.emit_json)
@@ -11,10 +11,18 @@ else:
 
 """Environment module for creating and managing SimKube simulations."""
 
+_SINGLETON = None
+
+
 def _get_env():
-    # Import lazily to avoid pulling kubernetes deps during test collection
-    from .sim_env import SimEnv  # local import
-    return SimEnv()
+    # Import lazily to avoid pulling kubernetes deps during test collection.
+    # Built once, so the kube config load and API connection pool are reused
+    # across every wrapper call.
+    global _SINGLETON
+    if _SINGLETON is None:
+        from .sim_env import SimEnv  # local import
+        _SINGLETON = SimEnv()
+    return _SINGLETON
 
 
 def create_simulation(name: str, trace_path: str, duration_s: int, namespace: str) -> str:
@@ -22,7 +30,7 @@ def create_simulation(name: str, trace_path: str, duration_s: int, namespace: st
     Create a Simulation CR and return its name.
     
     This is a wrapper function that matches the signature expected by runner/one_step.py.
-    It creates a SimEnv instance, calls create(), and returns the simulation name as a string.
+    It calls create() on the shared SimEnv and returns the simulation name as a string.
     
     Args:
         name: Kubernetes object name (DNS-1123 compliant)
@@ -65,3 +73,18 @@ def delete_simulation(name: str, namespace: str) -> None:
     """
     env = _get_env()
     env.delete(name=name, namespace=namespace)
+
+
+def delete_simulations(names: list[str], namespace: str) -> None:
+    """
+    Delete several Simulation CRs in *namespace* concurrently.
+    
+    Each name is deleted as delete_simulation() would, trying the simulation
+    first and then a configmap; the requests overlap instead of running back to back.
+    
+    Args:
+        names: Kubernetes object names
+        namespace: Target namespace
+    """
+    env = _get_env()
+    env.delete_many({"name": name, "ns": namespace} for name in names)
@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import re
+import string
 from typing import Any, Iterator, Mapping, MutableMapping
 
 
-_CPU_RE = re.compile(r"^([0-9]*\.?[0-9]+)(m?)$")
-_MEM_RE = re.compile(r"^([0-9]*\.?[0-9]+)([a-zA-Z]*)$")
+_NUMBER_CHARS = frozenset("0123456789.")
 
 _MEM_FACTORS = {
     "": 1,
@@ -32,19 +31,26 @@ def _iter_deployments(obj: Mapping[str, Any], deploy: str) -> Iterator[MutableMa
 
 
 def _first_container(deployment: MutableMapping[str, Any]) -> MutableMapping[str, Any] | None:
-    spec = deployment.get("spec") or {}
-    template = spec.get("template") or {}
-    pod_spec = template.get("spec") or {}
-    containers = pod_spec.get("containers") or []
-    if not containers:
+    # Plain subscripts on the happy path; any missing, empty or null level
+    # along the way means there is no container to edit
+    try:
+        container = deployment["spec"]["template"]["spec"]["containers"][0]
+    except (KeyError, IndexError, TypeError):
         return None
-    container = containers[0]
     if isinstance(container, MutableMapping):
         return container
     return None
 
 
 def _ensure_requests(container: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    try:
+        requests = container["resources"]["requests"]
+    except (KeyError, TypeError):
+        pass
+    else:
+        if isinstance(requests, MutableMapping):
+            return requests
+
     resources = container.get("resources")
     if not isinstance(resources, MutableMapping):
         resources = {}
@@ -58,14 +64,34 @@ def _ensure_requests(container: MutableMapping[str, Any]) -> MutableMapping[str,
     return requests
 
 
+def _split_quantity(text: str) -> tuple[str, str] | None:
+    """Split *text* into its decimal mantissa and trailing letter suffix.
+
+    Accepts the same strings as ``[0-9]*\\.?[0-9]+[a-zA-Z]*`` using only str
+    builtins, and returns None for anything else.
+    """
+    number = text.rstrip(string.ascii_letters)
+    if (
+        not number
+        or not number[-1].isdigit()
+        or number.count(".") > 1
+        or not _NUMBER_CHARS.issuperset(number)
+    ):
+        return None
+    return number, text[len(number):]
+
+
 def _parse_cpu(quantity: Any) -> tuple[int, str]:
     if quantity in (None, ""):
         return 0, "m"
     text = str(quantity).strip()
-    match = _CPU_RE.match(text)
-    if not match:
+    parts = _split_quantity(text)
+    if parts is None or parts[1] not in ("", "m"):
         raise ValueError(f"Unsupported CPU quantity: {quantity}")
-    number, unit = match.groups()
+    number, unit = parts
+    # Whole-number quantities (the usual case) stay in exact integer math
+    if "." not in number:
+        return (int(number), "m") if unit == "m" else (int(number) * 1000, unit)
     value = float(number)
     if unit == "m":
         millicores = int(round(value))
@@ -77,32 +103,29 @@ def _parse_cpu(quantity: Any) -> tuple[int, str]:
 
 
 def _format_cpu(millicores: int, preferred_unit: str) -> str:
-    if preferred_unit == "":
-        cores = millicores / 1000
-        if cores.is_integer():
-            return str(int(cores))
-        return f"{cores:.3f}".rstrip("0").rstrip(".")
-    preferred = preferred_unit or "m"
-    if preferred == "m":
+    if preferred_unit == "m":
         return f"{millicores}m"
-    cores = millicores / 1000
-    if cores.is_integer():
-        return str(int(cores))
-    return f"{cores:.3f}".rstrip("0").rstrip(".")
+    # Whole cores, or up to three decimals with trailing zeros dropped
+    cores, remainder = divmod(millicores, 1000)
+    if remainder == 0:
+        return str(cores)
+    return f"{cores}.{remainder:03d}".rstrip("0")
 
 
 def _parse_mem(quantity: Any) -> tuple[int, str]:
     if quantity in (None, ""):
         return 0, "Mi"
     text = str(quantity).strip()
-    match = _MEM_RE.match(text)
-    if not match:
+    parts = _split_quantity(text)
+    if parts is None:
         raise ValueError(f"Unsupported memory quantity: {quantity}")
-    number, unit = match.groups()
+    number, unit = parts
     unit = unit or "B"
     factor = _MEM_FACTORS.get(unit)
     if factor is None:
         raise ValueError(f"Unsupported memory unit: {unit}")
+    if "." not in number:
+        return int(number) * factor, unit
     bytes_val = int(round(float(number) * factor))
     return bytes_val, unit
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import mmap
 import os
 from pathlib import Path
 from typing import Any, Mapping
@@ -9,6 +10,31 @@ from typing import Any, Mapping
 import json
 import msgpack
 
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # optional; falls back to msgpack for decoding
+    ormsgpack = None
+
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _unpack(buf: Any) -> Any:
+    """Decode a MessagePack buffer, preferring ormsgpack when installed."""
+
+    if ormsgpack is not None:
+        try:
+            return ormsgpack.unpackb(buf)
+        except ormsgpack.MsgpackDecodeError:
+            # ormsgpack only takes str map keys; let msgpack decide the rest
+            pass
+    return msgpack.unpackb(buf, raw=False)
+
 
 def load_trace(path: str) -> dict[str, Any]:
     """Load a trace from *path*.
@@ -28,8 +54,14 @@ def load_trace(path: str) -> dict[str, Any]:
     if not src.exists():
         raise FileNotFoundError(f"Trace not found: {src}")
 
+    # Decode straight from a read-only mapping of the file, so the encoded
+    # trace is never copied into a bytes object alongside the parsed one
     with src.open("rb") as fh:
-        data = msgpack.load(fh, raw=False)
+        if os.fstat(fh.fileno()).st_size == 0:
+            data = _unpack(b"")  # mmap rejects empty files; fail as a decode error
+        else:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = _unpack(view)
 
     if not isinstance(data, dict):
         raise ValueError("Trace root must be a mapping")
@@ -46,8 +78,28 @@ def save_trace(obj: Mapping[str, Any], path: str) -> None:
     dst = Path(path)
     os.makedirs(dst.parent, exist_ok=True)
 
-    with dst.open("wb") as fh:
-        msgpack.dump(dict(obj), fh, use_bin_type=True)
+    # Pack top-level entries, and the items of top-level lists such as
+    # "events", one at a time so the whole encoded trace is never held in
+    # memory at once; the bytes are identical to packing the dict in one go.
+    # The small writes coalesce in a 1 MiB buffer, and the file only appears
+    # under its final name once complete.
+    packer = msgpack.Packer(use_bin_type=True)
+    tmp = dst.with_name(dst.name + ".tmp")
+    try:
+        with open(tmp, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            fh.write(packer.pack_map_header(len(obj)))
+            for key, value in obj.items():
+                fh.write(packer.pack(key))
+                if isinstance(value, list):
+                    fh.write(packer.pack_array_header(len(value)))
+                    for item in value:
+                        fh.write(packer.pack(item))
+                else:
+                    fh.write(packer.pack(value))
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def json_to_msgpack(json_path: str, output_path: str | None = None) -> str:
@@ -57,8 +109,11 @@ def json_to_msgpack(json_path: str, output_path: str | None = None) -> str:
     if not src.exists():
         raise FileNotFoundError(f"JSON trace not found: {src}")
 
-    with src.open("r", encoding="utf-8") as fh:
-        data = json.load(fh)
+    if orjson is not None:
+        data = orjson.loads(src.read_bytes())
+    else:
+        with src.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
 
     if not isinstance(data, Mapping):
         raise ValueError("JSON trace root must be a mapping")
@@ -2,57 +2,120 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable
+import warnings
+from functools import partial
+from typing import Any, Callable, Mapping
 
-from .ops import bump_cpu_small, bump_mem_small, scale_up_replicas
+from .ops import (
+    bump_cpu_small,
+    bump_mem_small,
+    reduce_cpu_small,
+    reduce_mem_small,
+    scale_down_replicas,
+    scale_up_replicas,
+)
 
-# Map action types to their corresponding functions
-ACTION_FUNCTIONS: dict[str, Callable[..., bool]] = {
-    "bump_cpu_small": bump_cpu_small,
-    "bump_mem_small": bump_mem_small,
-    "scale_up_replicas": scale_up_replicas,
+# Action type -> callable with its default parameters pre-bound, so dispatch
+# is one lookup and one call: ACTIONS[name](obj, deploy). Keyword arguments
+# passed at call time (e.g. an action's own "step") override the defaults.
+ACTIONS: dict[str, Callable[..., bool]] = {
+    "bump_cpu_small": partial(bump_cpu_small, step="500m"),
+    "bump_mem_small": partial(bump_mem_small, step="256Mi"),
+    "reduce_cpu_small": partial(reduce_cpu_small, step="500m"),
+    "reduce_mem_small": partial(reduce_mem_small, step="256Mi"),
+    "scale_up_replicas": partial(scale_up_replicas, delta=1),
+    "scale_down_replicas": partial(scale_down_replicas, delta=1),
 }
 
-# Default parameters for actions
-ACTION_DEFAULTS: dict[str, dict[str, Any]] = {
-    "bump_cpu_small": {"step": "500m"},
-    "bump_mem_small": {"step": "256Mi"},
-    "scale_up_replicas": {"delta": 1},
+# Keys of an action dict that are forwarded to its ACTIONS entry
+ACTION_PARAMS = ("step", "delta")
+
+# Deprecated split tables, still served (with a DeprecationWarning) for old
+# callers; they only ever listed the three "grow" actions
+_DEPRECATED_TABLES = {
+    "ACTION_FUNCTIONS": ("bump_cpu_small", "bump_mem_small", "scale_up_replicas"),
+    "ACTION_DEFAULTS": ("bump_cpu_small", "bump_mem_small", "scale_up_replicas"),
 }
 
+
+def __getattr__(name: str) -> Any:
+    if name not in _DEPRECATED_TABLES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    warnings.warn(f"{name} is deprecated; use ACTIONS instead", DeprecationWarning, stacklevel=2)
+    if name == "ACTION_FUNCTIONS":
+        return {key: ACTIONS[key].func for key in _DEPRECATED_TABLES[name]}
+    return {key: dict(ACTIONS[key].keywords) for key in _DEPRECATED_TABLES[name]}
+
+
+def action_params(action: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the parameters in *action* to pass to its ACTIONS entry."""
+    return {key: action[key] for key in ACTION_PARAMS if key in action}
+
+
 _MISSING = object()
 
 
-def diff_objects(before: Any, after: Any, path: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
-    """Compute a deep diff between two objects, returning a list of changes."""
-    if before is _MISSING:
-        return [{"path": list(path), "before": None, "after": after}]
-    if after is _MISSING:
-        return [{"path": list(path), "before": before, "after": None}]
-
-    if isinstance(before, dict) and isinstance(after, dict):
-        out: list[dict[str, Any]] = []
-        for key in sorted(set(before) | set(after), key=str):
-            out.extend(diff_objects(
-                before.get(key, _MISSING),
-                after.get(key, _MISSING),
-                path + (key,)
-            ))
-        return out
-
-    if isinstance(before, list) and isinstance(after, list):
-        out: list[dict[str, Any]] = []
-        for idx, (b_item, a_item) in enumerate(zip(before, after)):
-            out.extend(diff_objects(b_item, a_item, path + (idx,)))
-        if len(before) != len(after):
-            longer, marker = (before, "before") if len(before) > len(after) else (after, "after")
-            for idx in range(min(len(before), len(after)), len(longer)):
-                entry = {"path": list(path + (idx,)), "before": None, "after": None}
-                entry[marker] = longer[idx]
-                out.append(entry)
-        return out
-
-    if before != after:
-        return [{"path": list(path), "before": before, "after": after}]
-    return []
+def diff_objects(
+    before: Any,
+    after: Any,
+    path: tuple[Any, ...] = (),
+    *,
+    sort: bool = False,
+) -> list[dict[str, Any]]:
+    """Compute a deep diff between two objects, returning a list of changes.
+
+    Changes are reported depth-first. Dict keys are visited in insertion
+    order (keys of *before*, then keys only in *after*) unless *sort* is set,
+    which orders them by ``str(key)``. Subtrees shared by identity are
+    skipped without being walked.
+    """
+    out: list[dict[str, Any]] = []
+    # Each frame is either (before, after, path) to compare, or a finished
+    # change entry for a list element with no counterpart
+    stack: list[Any] = [(before, after, path)]
+    while stack:
+        frame = stack.pop()
+        if isinstance(frame, dict):
+            out.append(frame)
+            continue
+        before, after, path = frame
+
+        if before is _MISSING:
+            out.append({"path": list(path), "before": None, "after": after})
+            continue
+        if after is _MISSING:
+            out.append({"path": list(path), "before": before, "after": None})
+            continue
+        if before is after:
+            continue
+
+        if isinstance(before, dict) and isinstance(after, dict):
+            if sort:
+                keys = sorted(before.keys() | after.keys(), key=str)
+            elif before.keys() == after.keys():
+                keys = before  # same key set: no merge needed
+            else:
+                keys = list(before) + [key for key in after if key not in before]
+            # Pushed in reverse so they pop, and are reported, in order;
+            # values shared by identity can't differ and are never pushed
+            for key in reversed(keys):
+                b_item = before.get(key, _MISSING)
+                a_item = after.get(key, _MISSING)
+                if b_item is not a_item:
+                    stack.append((b_item, a_item, path + (key,)))
+            continue
+
+        if isinstance(before, list) and isinstance(after, list):
+            if len(before) != len(after):
+                longer, marker = (before, "before") if len(before) > len(after) else (after, "after")
+                for idx in range(len(longer) - 1, min(len(before), len(after)) - 1, -1):
+                    entry = {"path": list(path + (idx,)), "before": None, "after": None}
+                    entry[marker] = longer[idx]
+                    stack.append(entry)
+            for idx in range(min(len(before), len(after)) - 1, -1, -1):
+                stack.append((before[idx], after[idx], path + (idx,)))
+            continue
 
+        if before != after:
+            out.append({"path": list(path), "before": before, "after": after})
+    return out
@@ -1,8 +1,7 @@
 # env/sim_env.py
 import os
 import time
-from kubernetes import client, config
-from kubernetes.client.rest import ApiException
+from concurrent.futures import ThreadPoolExecutor
 
 # TODO: confirm these on your cluster:
 # kubectl api-resources --api-group=<group> -o wide
@@ -11,8 +10,24 @@ SIM_GROUP = "simkube.io"       # Updated to match SimKube docs
 SIM_VER = "v1"                 # Updated to match SimKube docs
 SIM_PLURAL = "simulations"
 
+# CRD names confirmed present in this process, shared by every SimEnv so
+# throwaway instances don't each pay an API round-trip for the check
+_CRD_CHECK_RESULT: dict[str, bool] = {}
+
+# Upper bound on concurrent delete requests in SimEnv.delete_many()
+MAX_DELETE_THREADS = 16
+
 class SimEnv:
+    __slots__ = ("custom", "core", "apix", "_client", "_ApiException")
+
     def __init__(self):
+        # The kubernetes client is ~200 ms to import, so it's only loaded once a
+        # SimEnv is actually built rather than whenever this module is imported.
+        from kubernetes import client, config
+        from kubernetes.client.rest import ApiException
+        self._client = client
+        self._ApiException = ApiException
+
         # Use ~/.kube/config if present; otherwise assume we're running in-cluster.
         try:
             config.load_kube_config()
@@ -21,17 +36,26 @@ class SimEnv:
         #TODO get cluster context name based on the name passed in during isengard just run simkube cluster-name = [];  kind-[cluster-name]
         
 
-        self.custom = client.CustomObjectsApi() # read/write CRDs (eg Simulation)
-        self.core = client.CoreV1Api() # read/write core objects (eg ConfigMap)
-        self.apix = client.ApiextensionsV1Api() # check CRD exist
+        # One ApiClient (and so one urllib3 pool) shared by all three APIs,
+        # so create/delete/CRD-check reuse keep-alive connections
+        api_client = client.ApiClient()
+        self.custom = client.CustomObjectsApi(api_client) # read/write CRDs (eg Simulation)
+        self.core = client.CoreV1Api(api_client) # read/write core objects (eg ConfigMap)
+        self.apix = client.ApiextensionsV1Api(api_client) # check CRD exist
 
     def _crd_installed(self) -> bool:
         # Fast, explicit check so we only fall back when the CRD truly isn't there.
+        # Only a positive answer is cached: a missing CRD is re-checked each
+        # time so installing it mid-run takes effect, and create() drops the
+        # cached answer if the Simulation API later 404s.
         crd_name = f"{SIM_PLURAL}.{SIM_GROUP}"
+        if _CRD_CHECK_RESULT.get(crd_name):
+            return True
         try:
             self.apix.read_custom_resource_definition(crd_name)
+            _CRD_CHECK_RESULT[crd_name] = True
             return True
-        except ApiException as e:
+        except self._ApiException as e:
             if e.status == 404:
                 return False
             # Any other error should propagate; don't silently fall back.
@@ -90,15 +114,18 @@ class SimEnv:
                     plural=SIM_PLURAL, body=body
                 )
                 return {"kind": "simulation", "name": name, "ns": namespace}
-            except ApiException as e:
+            except self._ApiException as e:
                 if e.status == 409:
                     # Already exists; treat as success so delete() can clean it.
                     return {"kind": "simulation", "name": name, "ns": namespace}
+                if e.status == 404:
+                    # CRD was removed since it was cached; check afresh next time
+                    _CRD_CHECK_RESULT.pop(f"{SIM_PLURAL}.{SIM_GROUP}", None)
                 raise  # real error—surface it
 
         # Fallback: prove create→wait→delete wiring without the CRD
-        cm = client.V1ConfigMap(
-            metadata=client.V1ObjectMeta(name=name, namespace=namespace),
+        cm = self._client.V1ConfigMap(
+            metadata=self._client.V1ObjectMeta(name=name, namespace=namespace),
             data={"tracePath": str(trace_path), "duration": str(int(duration_s))}
         )
         self.core.create_namespaced_config_map(namespace=namespace, body=cm)
@@ -132,10 +159,10 @@ class SimEnv:
                 self.custom.delete_cluster_custom_object(
                     group=SIM_GROUP, version=SIM_VER,
                     plural=SIM_PLURAL, name=name,
-                    body=client.V1DeleteOptions(propagation_policy="Foreground",
-                                                grace_period_seconds=0)
+                    body=self._client.V1DeleteOptions(propagation_policy="Foreground",
+                                                      grace_period_seconds=0)
                 )
-            except ApiException as e:
+            except self._ApiException as e:
                 if e.status != 404:
                     raise
         elif kind == "configmap":
@@ -143,9 +170,9 @@ class SimEnv:
             try:
                 self.core.delete_namespaced_config_map(
                     name=name, namespace=namespace,
-                    body=client.V1DeleteOptions()
+                    body=self._client.V1DeleteOptions()
                 )
-            except ApiException as e:
+            except self._ApiException as e:
                 if e.status != 404:
                     raise
         else:
@@ -155,11 +182,11 @@ class SimEnv:
                 self.custom.delete_cluster_custom_object(
                     group=SIM_GROUP, version=SIM_VER,
                     plural=SIM_PLURAL, name=name,
-                    body=client.V1DeleteOptions(propagation_policy="Foreground",
-                                                grace_period_seconds=0)
+                    body=self._client.V1DeleteOptions(propagation_policy="Foreground",
+                                                      grace_period_seconds=0)
                 )
                 return  # Success
-            except ApiException as e:
+            except self._ApiException as e:
                 if e.status != 404:
                     raise
             
@@ -167,9 +194,27 @@ class SimEnv:
             try:
                 self.core.delete_namespaced_config_map(
                     name=name, namespace=namespace,
-                    body=client.V1DeleteOptions()
+                    body=self._client.V1DeleteOptions()
                 )
-            except ApiException as e:
+            except self._ApiException as e:
                 if e.status != 404:
                     raise
                 # Both failed with 404, that's okay (idempotent)
+
+    def delete_many(self, handles):
+        """
+        Delete several objects created by create(), overlapping the API calls.
+
+        Each entry is a handle dict as accepted by delete(). The requests share
+        this SimEnv's connection pool; the first failure is re-raised once all
+        deletes have finished.
+        """
+        handles = list(handles)
+        if len(handles) <= 1:
+            for handle in handles:
+                self.delete(handle=handle)
+            return
+        with ThreadPoolExecutor(max_workers=min(len(handles), MAX_DELETE_THREADS)) as pool:
+            futures = [pool.submit(self.delete, handle=handle) for handle in handles]
+            for future in futures:
+                future.result()
@@ -11,19 +11,23 @@ job-dispatch layer.
 from __future__ import annotations
 
 import argparse
+import errno
 import json
 import os
+import select
 import shlex
 import socket
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Literal
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
@@ -42,6 +46,22 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_INVENTORY_DIR = REPO_ROOT / "runs" / "ec2_workers"
 DEFAULT_SSH_KEY_PATH = REPO_ROOT / "bob-s3-test-key.pem"
 
+# Shared by every EC2 call in a run: keep-alive sockets so waiter polls skip
+# the TLS handshake, and adaptive retries instead of failing on throttling
+EC2_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+
+# Poll more often than the boto3 defaults (15s x 40) within a similar
+# overall budget, so a fast boot is noticed within seconds
+RUNNING_WAITER_CONFIG = {"Delay": 5, "MaxAttempts": 120}
+STATUS_OK_WAITER_CONFIG = {"Delay": 10, "MaxAttempts": 60}
+
+# Upper bound on workers bootstrapped over SSH at the same time
+MAX_BOOTSTRAP_THREADS = 16
+
 ProgressCallback = Callable[[str], None]
 CleanupAction = Literal["stop", "terminate"]
 
@@ -368,6 +388,10 @@ def build_session(region: str) -> boto3.session.Session:
     return boto3.session.Session(region_name=region)
 
 
+def build_ec2_client(session: boto3.session.Session) -> Any:
+    return session.client("ec2", config=EC2_CLIENT_CONFIG)
+
+
 def normalize_launch_config(args: argparse.Namespace) -> LaunchConfig:
     if args.count is None:
         raise SystemExit("--count is required.")
@@ -454,32 +478,39 @@ def resolve_security_group_ids(ec2: Any, ids: list[str], names: list[str]) -> li
     return resolved
 
 
-def build_worker_tags(config: LaunchConfig, worker_id: str, name: str) -> list[dict[str, str]]:
+def build_run_tags(config: LaunchConfig) -> list[dict[str, str]]:
     return [
-        {"Key": "Name", "Value": name},
         {"Key": "Project", "Value": config.project_tag},
         {"Key": "Role", "Value": "worker"},
         {"Key": "SimArenaRunId", "Value": config.run_id},
-        {"Key": "WorkerId", "Value": worker_id},
         {"Key": "TraceBucket", "Value": config.trace_bucket},
         {"Key": "TracePath", "Value": config.trace_path},
     ]
 
 
+def build_worker_name_tags(worker_id: str, name: str) -> list[dict[str, str]]:
+    return [
+        {"Key": "Name", "Value": name},
+        {"Key": "WorkerId", "Value": worker_id},
+    ]
+
+
 def build_run_instances_request(
     config: LaunchConfig,
     *,
     security_group_ids: list[str],
-    worker_id: str,
-    name: str,
+    count: int,
 ) -> dict[str, Any]:
-    tags = build_worker_tags(config, worker_id=worker_id, name=name)
+    # One request for the whole batch; per-worker Name/WorkerId tags are
+    # added after launch since TagSpecifications apply to every instance.
+    # MinCount=1 keeps partial launches when capacity is short.
+    tags = build_run_tags(config)
     request: dict[str, Any] = {
         "ImageId": config.ami_id,
         "InstanceType": config.instance_type,
         "KeyName": config.key_name,
         "MinCount": 1,
-        "MaxCount": 1,
+        "MaxCount": count,
         "TagSpecifications": [
             {"ResourceType": "instance", "Tags": tags},
             {"ResourceType": "volume", "Tags": tags},
@@ -519,25 +550,42 @@ def launch_worker_instances(
 ) -> tuple[list[PendingLaunch], list[LaunchError]]:
     launched: list[PendingLaunch] = []
     errors: list[LaunchError] = []
-    for index in range(1, config.count + 1):
-        worker_id = f"{index:02d}"
-        name = f"{config.worker_prefix}-{config.run_id}-{worker_id}"
-        request = build_run_instances_request(
-            config,
-            security_group_ids=security_group_ids,
-            worker_id=worker_id,
-            name=name,
-        )
+    names = [
+        (f"{index:02d}", f"{config.worker_prefix}-{config.run_id}-{index:02d}")
+        for index in range(1, config.count + 1)
+    ]
+    request = build_run_instances_request(
+        config,
+        security_group_ids=security_group_ids,
+        count=config.count,
+    )
+    try:
+        response = ec2.run_instances(**request)
+    except ClientError as exc:
+        if progress:
+            progress(f"Launch failed for {config.count} worker(s): {exc}")
+        return launched, [LaunchError(worker_name=name, message=str(exc)) for _, name in names]
+
+    instances = sorted(response["Instances"], key=lambda instance: instance.get("AmiLaunchIndex", 0))
+    for (worker_id, name), instance in zip(names, instances):
+        instance_id = instance["InstanceId"]
+        launched.append(PendingLaunch(worker_id=worker_id, instance_id=instance_id, name=name))
         try:
-            response = ec2.run_instances(**request)
-            instance_id = response["Instances"][0]["InstanceId"]
-            launched.append(PendingLaunch(worker_id=worker_id, instance_id=instance_id, name=name))
-            if progress:
-                progress(f"Launched {name}: {instance_id}")
+            ec2.create_tags(Resources=[instance_id], Tags=build_worker_name_tags(worker_id, name))
         except ClientError as exc:
-            errors.append(LaunchError(worker_name=name, message=str(exc)))
+            # Still tagged with the run id, so cleanup by --run-id finds it
+            errors.append(LaunchError(worker_name=name, message=f"Launched {instance_id} but tagging failed: {exc}"))
             if progress:
-                progress(f"Launch failed for {name}: {exc}")
+                progress(f"Tagging failed for {name} ({instance_id}): {exc}")
+            continue
+        if progress:
+            progress(f"Launched {name}: {instance_id}")
+
+    for _, name in names[len(instances):]:
+        message = f"EC2 launched only {len(instances)} of {config.count} requested instances"
+        errors.append(LaunchError(worker_name=name, message=message))
+        if progress:
+            progress(f"Launch failed for {name}: {message}")
     return launched, errors
 
 
@@ -548,11 +596,11 @@ def wait_for_instances_readiness(
     wait_status_checks: bool,
     progress: ProgressCallback | None = None,
 ) -> None:
-    ec2.get_waiter("instance_running").wait(InstanceIds=instance_ids)
+    ec2.get_waiter("instance_running").wait(InstanceIds=instance_ids, WaiterConfig=RUNNING_WAITER_CONFIG)
     if progress:
         progress("Instances are running.")
     if wait_status_checks:
-        ec2.get_waiter("instance_status_ok").wait(InstanceIds=instance_ids)
+        ec2.get_waiter("instance_status_ok").wait(InstanceIds=instance_ids, WaiterConfig=STATUS_OK_WAITER_CONFIG)
         if progress:
             progress("Instances passed EC2 status checks (2/2).")
 
@@ -605,15 +653,23 @@ def get_secret_material(session: boto3.session.Session, region: str) -> dict[str
 
 
 def wait_for_tcp(host: str, port: int, timeout_s: int) -> None:
-    deadline = time.time() + timeout_s
+    # Non-blocking connect + select returns as soon as the port accepts,
+    # instead of on the next poll tick; retries back off 0.25s -> 4s.
+    deadline = time.monotonic() + timeout_s
+    delay = 0.25
     last_error: OSError | None = None
-    while time.time() < deadline:
-        try:
-            with socket.create_connection((host, port), timeout=5):
+    while (remaining := deadline - time.monotonic()) > 0:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setblocking(False)
+            err = sock.connect_ex((host, port))
+            if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                _, writable, _ = select.select([], [sock], [], min(5.0, remaining))
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if writable else errno.ETIMEDOUT
+            if err == 0:
                 return
-        except OSError as exc:
-            last_error = exc
-            time.sleep(5)
+            last_error = OSError(err, os.strerror(err))
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(4.0, delay * 2)
     raise TimeoutError(f"Timed out waiting for {host}:{port}. Last error: {last_error}")
 
 
@@ -694,10 +750,11 @@ def bootstrap_worker_instances(
 
     secret_material = get_secret_material(session, config.region)
     ssh_key_path = str(Path(config.ssh_key_path).expanduser().resolve())
-    for worker in workers:
+
+    def bootstrap_one(worker: WorkerRecord) -> None:
         if not worker.public_ip:
             worker.bootstrap.error = "No public IP available for SSH bootstrap."
-            continue
+            return
         if config.wait_ssh:
             wait_for_tcp(worker.public_ip, 22, timeout_s=config.startup_timeout)
         worker.bootstrap.ssh_ready = True
@@ -719,6 +776,15 @@ def bootstrap_worker_instances(
             if progress:
                 progress(f"Bootstrap failed on {worker.name}: {exc}")
 
+    # Each worker is an independent SSH wait + remote script, so bootstrap
+    # them side by side; results land on each WorkerRecord
+    if not workers:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(workers), MAX_BOOTSTRAP_THREADS)) as pool:
+        futures = [pool.submit(bootstrap_one, worker) for worker in workers]
+        for future in futures:
+            future.result()
+
 
 def assemble_launch_result(
     *,
@@ -754,7 +820,7 @@ def launch_workers(config: LaunchConfig, *, progress: ProgressCallback | None =
     validate_launch_config(config)
     session = build_session(config.region)
     caller_identity = verify_credentials(session)
-    ec2 = session.client("ec2")
+    ec2 = build_ec2_client(session)
     security_group_ids = resolve_security_group_ids(ec2, config.security_group_ids, config.security_group_names)
 
     launched, launch_errors = launch_worker_instances(
@@ -853,7 +919,7 @@ def resolve_workers(
         )
     if run_id:
         active_session = session or build_session(region)
-        ec2 = active_session.client("ec2")
+        ec2 = build_ec2_client(active_session)
         instances = collect_instances_for_run(ec2, project_tag, run_id)
         return ResolvedWorkers(
             region=region,
@@ -878,7 +944,7 @@ def cleanup_workers(
     progress: ProgressCallback | None = None,
 ) -> CleanupResult:
     session = build_session(config.region)
-    ec2 = session.client("ec2")
+    ec2 = build_ec2_client(session)
     resolved = resolve_workers(
         region=config.region,
         inventory_file=config.inventory_file,
@@ -32,7 +32,7 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from env.actions.ops import bump_cpu_small, reduce_mem_small, scale_down_replicas
+from env.actions.utils import ACTIONS, action_params
 from env.actions.trace_io import load_trace, save_trace
 from env.sim_env import SimEnv
 from ops.hooks import LocalHooks, wait_for_deployment_deleted, wait_for_pods_terminated
@@ -361,14 +361,10 @@ def _apply_action_to_trace(trace_path: str, deploy: str, action: dict[str, Any],
         raise ValueError(error or f"Action rejected: {action}")
 
     action_type = action["type"]
-    if action_type == "reduce_mem_small":
-        changed = reduce_mem_small(trace, deploy, step=action["step"])
-    elif action_type == "scale_down_replicas":
-        changed = scale_down_replicas(trace, deploy, delta=action["delta"])
-    elif action_type == "bump_cpu_small":
-        changed = bump_cpu_small(trace, deploy, step=action["step"])
-    else:
+    action_fn = ACTIONS.get(action_type)
+    if action_fn is None:
         raise ValueError(f"Unsupported action type for demo: {action_type}")
+    changed = action_fn(trace, deploy, **action_params(action))
 
     if not changed:
         raise RuntimeError(f"Action did not modify the trace: {action}")
@@ -108,7 +108,13 @@ def run_episode(
                     done=done
                 )
                 
-                if agent_name == "dqn" and hasattr(agent, "_train_step"):
+                # Extra updates follow the agent's train_freq: skipped on steps where update() didn't train
+                underlying = getattr(agent, "_agent", agent)
+                if (
+                    agent_name == "dqn"
+                    and hasattr(agent, "_train_step")
+                    and underlying.total_steps % getattr(underlying, "train_freq", 1) == 0
+                ):
                     for _ in range(updates_per_step - 1):
                         agent._train_step()
 
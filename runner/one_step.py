@@ -39,14 +39,7 @@ from env import create_simulation, wait_fixed, delete_simulation
 from observe.reader import observe, current_requests, add_obs_noise
 from observe.reward import get_reward
 from env.actions.trace_io import load_trace, save_trace
-from env.actions.ops import (
-    bump_cpu_small,
-    bump_mem_small,
-    reduce_cpu_small,
-    reduce_mem_small,
-    scale_up_replicas,
-    scale_down_replicas,
-)
+from env.actions.utils import ACTIONS, action_params
 from runner.safeguards import validate_action
 from runner.policies import get_policy
 
@@ -166,28 +159,12 @@ def apply_action(trace_path: str, action: dict, deploy: str, output_path: str) -
     action_type = action.get("type", "noop")
     changed = False
     
-    if action_type == "noop":
-        save_trace(trace, output_path)
-    elif action_type == "bump_cpu_small":
-        changed = bump_cpu_small(trace, deploy, step=action.get("step", "500m"))
-        save_trace(trace, output_path)
-    elif action_type == "bump_mem_small":
-        changed = bump_mem_small(trace, deploy, step=action.get("step", "256Mi"))
-        save_trace(trace, output_path)
-    elif action_type == "reduce_cpu_small":
-        changed = reduce_cpu_small(trace, deploy, step=action.get("step", "500m"))
-        save_trace(trace, output_path)
-    elif action_type == "reduce_mem_small":
-        changed = reduce_mem_small(trace, deploy, step=action.get("step", "256Mi"))
-        save_trace(trace, output_path)
-    elif action_type == "scale_up_replicas":
-        changed = scale_up_replicas(trace, deploy, delta=action.get("delta", 1))
-        save_trace(trace, output_path)
-    elif action_type == "scale_down_replicas":
-        changed = scale_down_replicas(trace, deploy, delta=action.get("delta", 1))
-        save_trace(trace, output_path)
-    else:
-        raise ValueError(f"Unknown action type: {action_type}")
+    if action_type != "noop":
+        action_fn = ACTIONS.get(action_type)
+        if action_fn is None:
+            raise ValueError(f"Unknown action type: {action_type}")
+        changed = action_fn(trace, deploy, **action_params(action))
+    save_trace(trace, output_path)
     
     info = {"changed": changed, "action_type": action_type, "blocked": False}
     return output_path, info
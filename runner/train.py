@@ -87,9 +87,18 @@ def main():
     parser.add_argument("--eps-end", type=float, default=0.1, help="Ending epsilon (default: 0.1)")
     parser.add_argument("--eps-decay", type=int, default=1000, help="Epsilon decay steps (default: 1000)")
     parser.add_argument("--buffer-size", type=int, default=2000, help="Replay buffer size (default: 2000)")
+    parser.add_argument("--replay-on-device", action="store_true", help="Keep the DQN replay buffer on the training device and sample there")
+    parser.add_argument("--replay-fp16", action="store_true", help="Store replay observations as float16 to halve buffer memory")
     parser.add_argument("--batch-size", type=int, default=32, help="Batch size (default: 32)")
     parser.add_argument("--target-update", type=int, default=50, help="Target network update frequency (default: 50)")
+    parser.add_argument("--tau", type=float, default=None, help="Polyak coefficient for soft target updates, e.g. 0.005 (default: hard updates every --target-update steps)")
     parser.add_argument("--updates-per-step", type=int, default=4, help="Number of gradient updates per environment step (default: 4)")
+    parser.add_argument("--train-freq", type=int, default=1, help="Run DQN gradient updates only every N environment steps (default: 1)")
+    parser.add_argument("--huber", action="store_true", help="Train the DQN with Huber (smooth L1) loss instead of MSE")
+    parser.add_argument("--compile", action="store_true", help="Wrap the DQN Q-networks with torch.compile")
+    parser.add_argument("--cuda-graph", action="store_true", help="Capture the DQN train step as a CUDA graph (CUDA only, not with --compile)")
+    parser.add_argument("--hidden-dims", type=int, nargs=2, default=[24, 48], help="DQN hidden layer widths (default: 24 48)")
+    parser.add_argument("--limit-cpu-threads", action="store_true", help="Run torch single-threaded when a small DQN trains on CPU")
 
     # cost_aware_v2 reward tuning
     parser.add_argument("--step-penalty", type=float, default=0.0, help="Per-step penalty to favor faster fixes (default: 0)")
@@ -175,7 +184,16 @@ def main():
             eps_decay_steps=args.eps_decay,
             replay_buffer_size=args.buffer_size,
             batch_size=args.batch_size,
-            target_update_freq=args.target_update
+            target_update_freq=args.target_update,
+            compile_network=args.compile,
+            hidden_dims=tuple(args.hidden_dims),
+            limit_cpu_threads=args.limit_cpu_threads,
+            tau=args.tau,
+            replay_obs_dtype="float16" if args.replay_fp16 else "float32",
+            train_freq=args.train_freq,
+            cuda_graph=args.cuda_graph,
+            replay_on_device=args.replay_on_device,
+            huber_loss=args.huber
         )
         file_ext = ".pt"
     elif args.agent == "random":
@@ -58,3 +58,139 @@ def test_agent_epsilon_zero_exploits():
     agent.update(1, 1.0)
     action3 = agent.act()
     assert action3 == 1  # Should exploit action 1
+
+
+def test_epsilon_greedy_act_batch():
+    """Test act_batch returns one valid action per environment and exploits when epsilon=0."""
+    from agent.eps_greedy import EpsilonGreedyAgent
+
+    agent = EpsilonGreedyAgent(n_actions=4, epsilon=0.0)
+    agent.update(2, 1.0)
+    actions = agent.act_batch([None] * 8)
+    assert actions.shape == (8,)
+    assert (actions == 2).all()
+
+    agent.epsilon = 1.0
+    actions = agent.act_batch([None] * 100)
+    assert ((actions >= 0) & (actions < 4)).all()
+
+
+def test_agent_act_batch_unsupported_for_llm():
+    """Test the facade raises a clear error for agents without act_batch."""
+    agent = Agent(AgentType.EPSILON_GREEDY, n_actions=4)
+    agent._agent = object()
+    with pytest.raises(NotImplementedError, match="act_batch"):
+        agent.act_batch([[0.0]])
+
+
+def test_moving_average_matches_convolve():
+    """Test the cumulative-sum moving average equals np.convolve in valid mode."""
+    import numpy as np
+    from agent.agent import moving_average
+
+    values = np.random.rand(250)
+    for window in (1, 7, 100):
+        expected = np.convolve(values, np.ones(window) / window, mode="valid")
+        assert np.allclose(moving_average(values, window), expected)
+    assert len(moving_average([1.0, 2.0], 5)) == 0
+
+
+def test_epsilon_greedy_cached_argmax_tracks_updates():
+    """Test the incrementally maintained greedy set matches a full argmax."""
+    import numpy as np
+    from agent.eps_greedy import EpsilonGreedyAgent
+
+    agent = EpsilonGreedyAgent(n_actions=5, epsilon=0.0)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        agent.update(int(rng.integers(5)), float(rng.choice([-1.0, 0.0, 1.0])))
+        expected = np.flatnonzero(agent.values == agent.values.max())
+        assert agent._best_actions().tolist() == expected.tolist()
+    assert agent.act() in expected
+
+
+def test_epsilon_greedy_keeps_cache_when_non_best_action_drops():
+    """Test a lower value for a non-best action keeps the cached greedy indices."""
+    from agent.eps_greedy import EpsilonGreedyAgent
+
+    agent = EpsilonGreedyAgent(n_actions=4, epsilon=0.0)
+    agent.update(2, 1.0)
+    cached = agent._best_actions()
+    mask = agent._best_mask
+    agent.update(0, -1.0)
+    agent.update(0, -0.5)
+    assert agent._best_actions() is cached
+    assert agent._best_mask is mask
+    assert cached.tolist() == [2]
+
+
+def test_exploration_draws_are_reproducible_under_random_seed():
+    """Test ExplorationDraws yields valid pairs and follows random.seed()."""
+    import random
+    from agent.agent import ExplorationDraws
+
+    def sample():
+        random.seed(123)
+        draws = ExplorationDraws(n_actions=4, pool_size=8)
+        return [draws.draw() for _ in range(20)]
+
+    first = sample()
+    assert first == sample()
+    assert all(0.0 <= u < 1.0 and 0 <= a < 4 for u, a in first)
+
+
+def test_random_agent_act_and_act_batch():
+    """Test the pooled random agent returns valid actions singly and in batches."""
+    agent = Agent(AgentType.RANDOM, n_actions=3)
+    actions = [agent.act() for _ in range(5000)]
+    assert all(isinstance(a, int) and 0 <= a < 3 for a in actions)
+    assert set(actions) == {0, 1, 2}
+    batch = agent.act_batch([None] * 6)
+    assert batch.shape == (6,)
+
+
+def test_random_agent_reward_buffer_grows_and_round_trips(tmp_path):
+    """Test the array-backed reward history grows past its capacity and survives save/load."""
+    from agent.random import REWARD_BUFFER_SIZE, RandomAgent
+
+    agent = RandomAgent(n_actions=3)
+    n = REWARD_BUFFER_SIZE + 10
+    for i in range(n):
+        agent.update(None, 0, None, 0.5 * i, i == n - 1)
+    assert agent.reward_history == [0.5 * i for i in range(n)]
+
+    path = str(tmp_path / "random.json")
+    agent.save(path)
+    loaded = RandomAgent(n_actions=3)
+    loaded.load(path)
+    assert loaded.reward_history == agent.reward_history
+    assert loaded.episode_reward_history == agent.episode_reward_history
+
+
+def test_random_agent_reward_history_is_a_snapshot():
+    """Test reward_history returns a list that later updates and buffer growth leave untouched."""
+    from agent.random import REWARD_BUFFER_SIZE, RandomAgent
+
+    agent = RandomAgent(n_actions=3)
+    agent.update(None, 0, None, 1.0, False)
+    snapshot = agent.reward_history
+    assert isinstance(snapshot, list)
+    for _ in range(REWARD_BUFFER_SIZE + 1):
+        agent.update(None, 0, None, 2.0, False)
+    assert snapshot == [1.0]
+    assert len(agent.reward_history) == REWARD_BUFFER_SIZE + 2
+
+
+def test_random_agent_save_without_orjson(tmp_path, monkeypatch):
+    """Test RandomAgent save/load falls back to stdlib json when orjson is unavailable."""
+    import agent.random as random_module
+
+    monkeypatch.setattr(random_module, "orjson", None)
+    agent = random_module.RandomAgent(n_actions=3)
+    agent.update(None, 0, None, 1.5, True)
+    path = str(tmp_path / "random.json")
+    agent.save(path)
+    loaded = random_module.RandomAgent(n_actions=3)
+    loaded.load(path)
+    assert loaded.reward_history == [1.5]
+    assert loaded.episode_reward_history == [1.5]
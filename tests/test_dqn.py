@@ -0,0 +1,326 @@
+"""Tests for agent/dqn.py"""
+
+import numpy as np
+import pytest
+import torch
+
+from agent.dqn import DQNAgent, ReplayMemory
+
+
+def test_replay_memory_push_and_len():
+    """Test push fills the buffer up to capacity and then wraps."""
+    memory = ReplayMemory(capacity=3, state_dim=2)
+    for i in range(5):
+        memory.push([i, i], i % 2, [i + 1, i + 1], float(i), i == 4)
+    assert len(memory) == 3
+    assert memory.pos == 2
+    # Slots 0 and 1 were overwritten by transitions 3 and 4
+    assert memory.states[0].tolist() == [3.0, 3.0]
+    assert memory.states[1].tolist() == [4.0, 4.0]
+    assert bool(memory.dones[1]) is True
+
+
+def test_replay_memory_sample_shapes():
+    """Test sample returns stacked batches with the expected shapes and dtypes."""
+    memory = ReplayMemory(capacity=10, state_dim=5)
+    for i in range(10):
+        memory.push([0.1] * 5, i % 7, [0.2] * 5, 1.0, False)
+    batch = memory.sample(4)
+    assert batch.state.shape == (4, 5)
+    assert batch.next_state.shape == (4, 5)
+    assert batch.action.shape == (4, 1)
+    assert batch.action.dtype == torch.int64
+    assert batch.reward.shape == (4,)
+    assert batch.done.dtype == torch.bool
+
+
+def test_dqn_update_trains_once_buffer_full():
+    """Test update records a loss only after batch_size transitions."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=4, device=torch.device("cpu"))
+    for i in range(3):
+        agent.update([0.1] * 5, i, [0.2] * 5, 1.0, False)
+    assert agent.loss_history == []
+    agent.update([0.1] * 5, 3, [0.2] * 5, 1.0, True)
+    assert len(agent.loss_history) == 1
+    assert agent.episode_reward_history == [pytest.approx(4.0)]
+
+
+def test_dqn_act_returns_valid_index():
+    """Test act returns an int action index in both explore and exploit modes."""
+    agent = DQNAgent(state_dim=5, n_actions=7, eps_start=0.0, eps_end=0.0, device=torch.device("cpu"))
+    action = agent.act([0.1] * 5)
+    assert isinstance(action, int)
+    assert 0 <= action < 7
+
+
+def test_replay_memory_compact_obs_dtype():
+    """Test integer observations are stored compactly and rescaled to float32 on sample."""
+    memory = ReplayMemory(capacity=4, state_dim=3, obs_dtype=np.uint8, obs_scale=1.0 / 255.0)
+    memory.push([0, 255, 51], 1, [255, 0, 51], 0.0, False)
+    assert memory.states.dtype == np.uint8
+    batch = memory.sample(2)
+    assert batch.state.dtype == torch.float32
+    assert batch.state[0].tolist() == pytest.approx([0.0, 1.0, 0.2])
+
+
+def test_dqn_target_sync_copies_weights():
+    """Test the periodic target-network sync makes both networks identical."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, target_update_freq=3, device=torch.device("cpu"))
+    for i in range(3):
+        agent.update([0.1 * i] * 5, i, [0.2] * 5, 1.0, False)
+    for q, t in zip(agent.q_net.parameters(), agent.target_net.parameters()):
+        assert torch.equal(q, t)
+        assert not t.requires_grad
+
+
+def test_dqn_act_batch_greedy_matches_act():
+    """Test act_batch returns one action per state and agrees with act when not exploring."""
+    agent = DQNAgent(state_dim=5, n_actions=7, eps_start=0.0, eps_end=0.0, device=torch.device("cpu"))
+    states = np.random.rand(6, 5).astype(np.float32)
+    actions = agent.act_batch(states)
+    assert actions.shape == (6,)
+    assert actions.tolist() == [agent.act(s) for s in states]
+
+
+def test_replay_memory_sample_without_replacement():
+    """Test a batch drawn from a just-filled buffer contains every transition once."""
+    memory = ReplayMemory(capacity=8, state_dim=1)
+    for i in range(8):
+        memory.push([i], 0, [i], 0.0, False)
+    batch = memory.sample(8)
+    assert sorted(batch.state.flatten().tolist()) == [float(i) for i in range(8)]
+
+
+def test_replay_memory_large_buffer_samples_with_randint(monkeypatch):
+    """Test a buffer many batches deep draws indices with randint, not a full permutation."""
+    memory = ReplayMemory(capacity=64, state_dim=1)
+    for i in range(64):
+        memory.push([i], 0, [i], 0.0, False)
+    monkeypatch.setattr(torch, "randperm", lambda *a, **k: pytest.fail("randperm on a large buffer"))
+    batch = memory.sample(4)
+    assert batch.state.shape == (4, 1)
+    assert all(0 <= x < 64 for x in batch.state.flatten().tolist())
+
+
+def test_dqn_accepts_device_string():
+    """Test an explicit device given as a string is normalized to torch.device."""
+    agent = DQNAgent(state_dim=5, n_actions=7, device="cpu")
+    assert agent.device == torch.device("cpu")
+
+
+def test_dqn_compiled_network_smoke():
+    """Test the torch.compile path (CPU default mode) acts and trains."""
+    agent = DQNAgent(
+        state_dim=5, n_actions=7, batch_size=4, eps_start=0.0, eps_end=0.0,
+        device="cpu", compile_network=True,
+    )
+    for i in range(4):
+        agent.update([0.1 * i] * 5, i, [0.2] * 5, 1.0, False)
+    assert len(agent.loss_history) == 1
+    assert 0 <= agent.act([0.1] * 5) < 7
+
+
+def test_dqn_auto_device_prefers_cpu_for_small_networks(monkeypatch):
+    """Test CUDA is only auto-selected once the widest layer reaches GPU_MIN_LAYER_SIZE."""
+    from agent.dqn import GPU_MIN_LAYER_SIZE
+
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: True)
+    assert DQNAgent._auto_device(5, (24, 48)) == torch.device("cpu")
+    assert DQNAgent._auto_device(GPU_MIN_LAYER_SIZE // 64, (32, 64)) == torch.device("cuda")
+
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    assert DQNAgent._auto_device(GPU_MIN_LAYER_SIZE // 64, (32, 64)) == torch.device("cpu")
+
+
+def test_dqn_checkpoint_round_trips_hidden_dims(tmp_path):
+    """Test hidden_dims is saved and a mismatched agent refuses the checkpoint."""
+    path = str(tmp_path / "dqn.pt")
+    DQNAgent(state_dim=5, n_actions=7, hidden_dims=(16, 32), device="cpu").save(path)
+
+    agent = DQNAgent(state_dim=5, n_actions=7, hidden_dims=(16, 32), device="cpu")
+    agent.load(path)
+    assert agent.hidden_dims == (16, 32)
+
+    with pytest.raises(ValueError, match="hidden_dims"):
+        DQNAgent(state_dim=5, n_actions=7, device="cpu").load(path)
+
+
+def test_dqn_act_batch_accepts_tensors_and_rejects_single_state():
+    """Test act_batch takes a 2-D tensor and refuses a 1-D single state."""
+    agent = DQNAgent(state_dim=5, n_actions=7, device="cpu")
+    assert agent.act_batch(torch.rand(3, 5)).shape == (3,)
+    with pytest.raises(ValueError, match="state_dim"):
+        agent.act_batch([0.1] * 5)
+
+
+def test_dqn_epsilon_table_matches_closed_form():
+    """Test the precomputed epsilon schedule equals the linear-decay formula."""
+    agent = DQNAgent(state_dim=5, n_actions=7, eps_start=1.0, eps_end=0.1, eps_decay_steps=1000, device="cpu")
+
+    def closed_form(step):
+        if step >= agent.eps_decay_steps:
+            return agent.eps_end
+        return agent.eps_start - (agent.eps_start - agent.eps_end) * (step / agent.eps_decay_steps)
+
+    for step in (0, 500, 999, 1000, 5000):
+        agent.total_steps = step
+        assert agent._calculate_epsilon() == pytest.approx(closed_form(step), abs=1e-12)
+
+
+def test_dqn_soft_target_update():
+    """Test Polyak updates move the target net toward q_net by tau per train step."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, tau=0.5, device="cpu")
+    with torch.no_grad():
+        for p in agent.target_net.parameters():
+            p.zero_()
+    before = [p.detach().clone() for p in agent.q_net.parameters()]
+    agent._soft_update_target_net()
+    for q, t in zip(before, agent.target_net.parameters()):
+        assert torch.allclose(t, 0.5 * q)
+
+
+def test_replay_memory_float16_obs():
+    """Test float16 observation storage samples back as float32."""
+    memory = ReplayMemory(capacity=4, state_dim=2, obs_dtype=np.float16)
+    memory.push([0.25, 0.5], 0, [0.75, 1.0], 0.0, False)
+    assert memory.states.nbytes == 4 * 2 * 2
+    batch = memory.sample(1)
+    assert batch.next_state.dtype == torch.float32
+    assert batch.next_state[0].tolist() == [0.75, 1.0]
+
+
+def test_dqn_train_freq_skips_updates():
+    """Test gradient steps only run every train_freq environment steps."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, train_freq=4, device="cpu")
+    for i in range(8):
+        agent.update([0.1] * 5, i % 7, [0.2] * 5, 1.0, False)
+    assert len(agent.loss_history) == 2
+
+
+def test_dqn_cuda_graph_falls_back_to_eager_on_cpu():
+    """Test cuda_graph is a no-op off CUDA and refuses to combine with compile_network."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, device="cpu", cuda_graph=True)
+    for i in range(3):
+        agent.update([0.1] * 5, i, [0.2] * 5, 1.0, False)
+    assert agent._graph is None
+    assert len(agent.loss_history) == 2
+
+    with pytest.raises(ValueError, match="cuda_graph"):
+        DQNAgent(state_dim=5, n_actions=7, device="cpu", cuda_graph=True, compile_network=True)
+
+
+def test_dqn_load_matches_optimizer_capturable_to_agent_mode(tmp_path):
+    """Test checkpoints cross between CUDA-graph and eager agents and keep training."""
+    path = str(tmp_path / "dqn.pt")
+    graph_run = DQNAgent(state_dim=5, n_actions=7, batch_size=2, device="cpu")
+    for i in range(3):
+        graph_run.update([0.1] * 5, i, [0.2] * 5, 1.0, False)
+    # Stand-in for a checkpoint written by a --cuda-graph run
+    for group in graph_run.optimizer.param_groups:
+        group["capturable"] = True
+    graph_run.save(path)
+
+    eager = DQNAgent(state_dim=5, n_actions=7, batch_size=2, device="cpu")
+    eager.load(path)
+    assert all(group["capturable"] is False for group in eager.optimizer.param_groups)
+    eager.memory.push([0.1] * 5, 0, [0.2] * 5, 1.0, False)
+    eager.memory.push([0.3] * 5, 1, [0.4] * 5, 0.0, True)
+    eager._train_step()
+    eager.save(path)
+
+    graph = DQNAgent(state_dim=5, n_actions=7, batch_size=2, device="cpu")
+    graph._use_cuda_graph = True  # as on a CUDA device with cuda_graph=True
+    graph.load(path)
+    assert all(group["capturable"] is True for group in graph.optimizer.param_groups)
+
+
+def test_dqn_replay_obs_dtype_keeps_fractional_states():
+    """Test float16 replay storage round-trips normalized states and integer dtypes are refused."""
+    agent = DQNAgent(state_dim=3, n_actions=2, batch_size=1, device="cpu", replay_obs_dtype="float16")
+    agent.memory.push([0.4, 0.9, 1.2], 0, [0.5, 0.2, 0.7], 0.0, False)
+    batch = agent.memory.sample(1)
+    assert batch.state.dtype == torch.float32
+    assert batch.state.flatten().tolist() == pytest.approx([0.4, 0.9, 1.2], abs=1e-3)
+    assert batch.next_state.flatten().tolist() == pytest.approx([0.5, 0.2, 0.7], abs=1e-3)
+
+    with pytest.raises(ValueError, match="replay_obs_dtype"):
+        DQNAgent(state_dim=3, n_actions=2, device="cpu", replay_obs_dtype="uint8")
+
+
+def test_replay_memory_compact_actions():
+    """Test actions are stored as uint8 for small action spaces and sampled as int64."""
+    memory = ReplayMemory(capacity=4, state_dim=2, n_actions=7)
+    memory.push([0.0, 0.0], 6, [0.0, 0.0], 0.0, False)
+    assert memory.actions.dtype == np.uint8
+    batch = memory.sample(1)
+    assert batch.action.dtype == torch.int64
+    assert batch.action.tolist() == [[6]]
+    assert ReplayMemory(capacity=4, state_dim=2, n_actions=300).actions.dtype == np.int64
+
+
+def test_dqn_loss_history_is_flushed_lazily():
+    """Test train-step losses stay on device until loss_history is read."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, device="cpu")
+    for i in range(4):
+        agent.update([0.1] * 5, i, [0.2] * 5, 1.0, False)
+    assert len(agent._pending_losses) == 3
+    assert len(agent.loss_history) == 3
+    assert agent._pending_losses == []
+    assert all(isinstance(x, float) for x in agent.loss_history)
+
+
+def test_replay_memory_push_batch_matches_push():
+    """Test push_batch writes rows in order and wraps like repeated push."""
+    one, many = ReplayMemory(capacity=3, state_dim=1), ReplayMemory(capacity=3, state_dim=1)
+    for i in range(5):
+        one.push([i], i, [i + 1], float(i), i == 4)
+    many.push_batch([[i] for i in range(5)], list(range(5)), [[i + 1] for i in range(5)],
+                    [float(i) for i in range(5)], [i == 4 for i in range(5)])
+    assert (one.pos, one.size) == (many.pos, many.size)
+    assert np.array_equal(one.states, many.states)
+    assert np.array_equal(one.actions, many.actions)
+    assert np.array_equal(one.dones, many.dones)
+
+
+def test_dqn_update_batch_counts_steps_and_episodes():
+    """Test update_batch advances one step per row and tracks per-env returns."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, train_freq=2, device="cpu")
+    states = np.full((4, 5), 0.1, dtype=np.float32)
+    agent.update_batch(states, [0, 1, 2, 3], states, [1.0, 2.0, 3.0, 4.0], [False, True, False, False])
+    agent.update_batch(states, [0, 1, 2, 3], states, [1.0, 1.0, 1.0, 1.0], [True, False, False, False])
+    assert agent.total_steps == 8
+    assert len(agent.memory) == 8
+    assert len(agent.loss_history) == 4
+    assert agent.episode_reward_history == [2.0, 2.0]
+
+
+def test_dqn_act_async_drains_in_order():
+    """Test act_async queues on-device actions that drain() returns as ints."""
+    agent = DQNAgent(state_dim=5, n_actions=7, eps_start=0.0, eps_end=0.0, device="cpu")
+    states = np.random.rand(3, 5).astype(np.float32)
+    for s in states:
+        assert isinstance(agent.act_async(s), torch.Tensor)
+    assert agent.drain() == [agent.act(s) for s in states]
+    assert agent.drain() == []
+
+
+def test_replay_memory_device_storage():
+    """Test device_storage keeps tensors as storage and samples like the host buffer."""
+    memory = ReplayMemory(capacity=4, state_dim=2, n_actions=7, device="cpu", device_storage=True)
+    assert isinstance(memory.states, torch.Tensor)
+    memory.push([0.5, 1.0], 3, [1.5, 2.0], 1.0, True)
+    memory.push_batch([[0.0, 0.0]] * 2, [1, 2], [[0.0, 0.0]] * 2, [0.0, 0.0], [False, False])
+    assert len(memory) == 3
+    batch = memory.sample(3)
+    assert batch.action.dtype == torch.int64
+    assert sorted(batch.action.flatten().tolist()) == [1, 2, 3]
+    assert batch.done.sum().item() == 1
+
+
+def test_dqn_huber_loss_is_linear_for_large_errors():
+    """Test huber_loss switches the TD loss to smooth L1."""
+    agent = DQNAgent(state_dim=5, n_actions=7, batch_size=2, huber_loss=True, device="cpu")
+    for i in range(2):
+        agent.update([0.0] * 5, i, [0.0] * 5, 100.0, True)
+    # Terminal targets of 100: MSE would be ~1e4, Huber ~100
+    assert agent.loss_history[0] < 200.0
@@ -11,6 +11,7 @@ from env.actions.ops import (
     scale_up_replicas,
     scale_down_replicas,
 )
+from env.actions.utils import ACTIONS, diff_objects
 
 
 def _sample_trace() -> dict:
@@ -115,6 +116,80 @@ class OpsTestCase(unittest.TestCase):
         self.assertFalse(changed)
         self.assertEqual(trace, before)
 
+    def test_core_cpu_values_keep_core_units(self) -> None:
+        trace = _sample_trace()
+        requests = trace["events"][0]["applied_objs"][0]["spec"]["template"]["spec"]["containers"][0]["resources"]["requests"]
+        requests["cpu"] = "1.5"
+        bump_cpu_small(trace, "web", step="250m")
+        self.assertEqual(requests["cpu"], "1.75")
+        bump_cpu_small(trace, "web", step="250m")
+        self.assertEqual(requests["cpu"], "2")
+
+    def test_malformed_quantities_are_rejected(self) -> None:
+        for step in ("1.", ".", "1.2.3", "1e3m", "-500m", "500x"):
+            with self.subTest(step=step), self.assertRaises(ValueError):
+                bump_cpu_small(_sample_trace(), "web", step=step)
+        for step in ("1.Mi", "1e3Mi", "256Xi"):
+            with self.subTest(step=step), self.assertRaises(ValueError):
+                bump_mem_small(_sample_trace(), "web", step=step)
+
+
+    def test_whole_number_memory_is_exact(self) -> None:
+        trace = _sample_trace()
+        requests = trace["events"][0]["applied_objs"][0]["spec"]["template"]["spec"]["containers"][0]["resources"]["requests"]
+        requests["memory"] = "9007199254740993B"  # 2**53 + 1 bytes, not representable as a float
+        bump_mem_small(trace, "web", step="1B")
+        self.assertEqual(requests["memory"], "9007199254740994B")
+
+    def test_action_table_binds_defaults(self) -> None:
+        trace = _sample_trace()
+        self.assertTrue(ACTIONS["bump_cpu_small"](trace, "web"))
+        self.assertTrue(ACTIONS["scale_up_replicas"](trace, "web", delta=3))
+        deployment = trace["events"][0]["applied_objs"][0]
+        self.assertEqual(deployment["spec"]["template"]["spec"]["containers"][0]["resources"]["requests"]["cpu"], "1000m")
+        self.assertEqual(deployment["spec"]["replicas"], 5)
+        self.assertTrue(ACTIONS["scale_down_replicas"](trace, "web"))
+        self.assertEqual(deployment["spec"]["replicas"], 4)
+
+    def test_split_action_tables_are_deprecated(self) -> None:
+        from env.actions import utils
+
+        with self.assertWarns(DeprecationWarning):
+            functions = utils.ACTION_FUNCTIONS
+        with self.assertWarns(DeprecationWarning):
+            defaults = utils.ACTION_DEFAULTS
+        self.assertIs(functions["bump_mem_small"], bump_mem_small)
+        self.assertEqual(defaults["bump_mem_small"], {"step": "256Mi"})
+
+    def test_diff_objects_reports_changes_in_order(self) -> None:
+        before = _sample_trace()
+        after = copy.deepcopy(before)
+        bump_cpu_small(after, "web")
+        after["events"].append({"ts": 2})
+        after["comment"] = "bumped"
+        container = ["events", 0, "applied_objs", 0, "spec", "template", "spec", "containers", 0]
+        self.assertEqual(
+            diff_objects(before, after),
+            [
+                {"path": container + ["resources", "requests", "cpu"], "before": "500m", "after": "1000m"},
+                {"path": ["events", 1], "before": None, "after": {"ts": 2}},
+                {"path": ["comment"], "before": None, "after": "bumped"},
+            ],
+        )
+        self.assertEqual(diff_objects(before, after, sort=True)[0]["path"], ["comment"])
+
+    def test_diff_objects_handles_deep_nesting(self) -> None:
+        before: dict = {}
+        after: dict = {}
+        b, a = before, after
+        for _ in range(5000):
+            b["x"], a["x"] = {}, {}
+            b, a = b["x"], a["x"]
+        a["leaf"] = 1
+        changes = diff_objects(before, after)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["path"], ["x"] * 5000 + ["leaf"])
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+import unittest.mock
 from pathlib import Path
 
+import msgpack
+
+from env.actions import trace_io
 from env.actions.trace_io import load_trace, save_trace
 
 
@@ -16,6 +20,44 @@ class TraceIOTestCase(unittest.TestCase):
             loaded = load_trace(dst)
         self.assertEqual(loaded, payload)
 
+    def test_streamed_pack_matches_packb(self) -> None:
+        payload = {"version": 2, "events": [{"ts": 1, "applied_objs": [{"kind": "Deployment"}]}, {"ts": 2}], "index": {}}
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = Path(tmp) / "trace.msgpack"
+            save_trace(payload, dst)
+            self.assertEqual(dst.read_bytes(), msgpack.packb(payload, use_bin_type=True))
+
+    def test_save_is_atomic_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = Path(tmp) / "trace.msgpack"
+            save_trace({"version": 1}, dst)
+            with self.assertRaises(TypeError):
+                save_trace({"version": 2, "events": [object()]}, dst)
+            self.assertEqual(load_trace(dst), {"version": 1})
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["trace.msgpack"])
+
+    def test_load_without_ormsgpack(self) -> None:
+        payload = {"version": 2, "events": [{"ts": 1, "blob": b"\x00"}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = Path(tmp) / "trace.msgpack"
+            save_trace(payload, dst)
+            with unittest.mock.patch.object(trace_io, "ormsgpack", None):
+                self.assertEqual(load_trace(dst), payload)
+
+    def test_bytes_keys_fall_back_to_msgpack(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = Path(tmp) / "trace.msgpack"
+            dst.write_bytes(msgpack.packb({"version": 1, "index": {b"raw": 1}}, use_bin_type=True))
+            self.assertEqual(load_trace(dst), {"version": 1, "index": {b"raw": 1}})
+
+    def test_truncated_or_empty_file_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = Path(tmp) / "trace.msgpack"
+            for data in (msgpack.packb({"version": 1, "events": [1, 2]})[:-1], b""):
+                dst.write_bytes(data)
+                with self.assertRaises(ValueError):
+                    load_trace(dst)
+
     def test_missing_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             missing = Path(tmp) / "nope.msgpack"